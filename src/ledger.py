@@ -3,10 +3,17 @@ Privacy Ledger / Audit Layer
 Stores transactions with privacy-preserving features
 """
 
+import atexit
+import gzip
 import json
 import hashlib
+import queue
+import sqlite3
+import threading
+import time
+from array import array
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -18,7 +25,7 @@ class LedgerEntryType(Enum):
     AML_FLAGGED = "aml_flagged"
 
 
-@dataclass
+@dataclass(slots=True)
 class LedgerEntry:
     """Entry in the privacy ledger"""
     entry_id: str
@@ -31,12 +38,24 @@ class LedgerEntry:
     entry_type: LedgerEntryType
     timestamp: str
     metadata: Dict[str, Any] = None
-    
+    _serialized: Optional[str] = field(init=False, repr=False, default=None)
+
     def __post_init__(self):
         """Initialize metadata if not provided"""
         if self.metadata is None:
             self.metadata = {}
-    
+
+    def to_json(self) -> str:
+        """Canonical JSON form, cached after first use
+
+        Entries never change after insertion, so the serialized string
+        is computed once and shared by the hash chain, the append log
+        and every export.
+        """
+        if self._serialized is None:
+            self._serialized = json.dumps(self.to_dict(), sort_keys=True)
+        return self._serialized
+
     def to_dict(self) -> Dict:
         """Convert to dictionary for serialization"""
         return {
@@ -53,6 +72,55 @@ class LedgerEntry:
         }
 
 
+_ts_cache = (-1, '')
+
+
+def _iso_now() -> str:
+    """ISO timestamp, rebuilt only when the clock ticks a new second
+
+    Burst inserts would otherwise pay for a datetime allocation and
+    isoformat() string build per entry.
+    """
+    global _ts_cache
+    second = int(time.time())
+    cached_second, cached_value = _ts_cache
+    if second != cached_second:
+        cached_value = datetime.now().isoformat()
+        _ts_cache = (second, cached_value)
+    return cached_value
+
+
+def _write_export(filename: str, scalars: Dict, entry_lists: Dict,
+                  compress: bool = False) -> None:
+    """Stream an export file to disk entry by entry
+
+    Serializes each entry as it is written instead of materializing
+    every to_dict() result and the full document string in memory.
+    With compress=True the stream goes through gzip, which collapses
+    the repetitive keys and cuts both file size and write pressure.
+    """
+    opener = gzip.open(filename, 'wt') if compress else open(filename, 'w')
+    with opener as f:
+        f.write('{\n')
+        first = True
+        for key, value in scalars.items():
+            if not first:
+                f.write(',\n')
+            f.write(f'  {json.dumps(key)}: {json.dumps(value)}')
+            first = False
+        for key, entries in entry_lists.items():
+            if not first:
+                f.write(',\n')
+            f.write(f'  {json.dumps(key)}: [\n')
+            separator = ''
+            for entry in entries:
+                f.write(separator + '    ' + entry.to_json())
+                separator = ',\n'
+            f.write('\n  ]')
+            first = False
+        f.write('\n}\n')
+
+
 class LedgerManager:
     """Manages the privacy ledger and audit capabilities"""
     
@@ -61,48 +129,139 @@ class LedgerManager:
         self.entries: Dict[str, LedgerEntry] = {}
         self.entry_counter = 0
         self.token_manager = None  # Will be set by main system
+        # Secondary indexes: entry_id sets keyed by wallet, transaction and type,
+        # maintained on insert so audit queries avoid full-ledger scans
+        self._by_wallet: Dict[str, set] = {}
+        self._by_txid: Dict[str, set] = {}
+        self._by_type: Dict[LedgerEntryType, set] = {entry_type: set() for entry_type in LedgerEntryType}
+        # Running value aggregates so statistics stay O(1) as the ledger grows
+        self._total_value = 0
+        self._anonymous_value = 0
+        self._non_anonymous_value = 0
+        # Chained BLAKE2b integrity hash, advanced once per entry in
+        # insertion order; starts from an all-zero genesis digest
+        self._running_hash = bytes(32)
+        # Packed columns (structure-of-arrays) for scan-heavy queries:
+        # parallel to each other and appended in insertion order
+        self._ids: List[str] = []
+        self._values = array('q')
+        self._timestamps: List[str] = []
         self._load_ledger()
+        # Append-only log: each insert writes one JSON line instead of
+        # rewriting the whole snapshot; compact() folds the log back in
+        self._log_file = open(self.ledger_file + ".log", 'a')
+        # SQLite mirror gives B-tree indexes for value/date range queries
+        self._init_db()
+        # Persistence runs on a background thread: inserts enqueue and
+        # return, the writer batches log appends and database commits
+        self._write_q = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+        # The writer is a daemon thread, so without this a clean
+        # interpreter exit would drop whatever is still queued
+        atexit.register(self.flush)
+
+    def _init_db(self):
+        """Open the SQLite query index and sync it with loaded entries"""
+        # The audit-query APIs get called from server worker threads,
+        # so the shared read connection must not be pinned to the
+        # constructing thread; the lock serializes access to it
+        self._db = sqlite3.connect(self.ledger_file + ".db", check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "entry_id TEXT PRIMARY KEY, transaction_id TEXT, "
+            "sender_wallet_id TEXT, receiver_wallet_id TEXT, "
+            "token_id TEXT, value INTEGER, is_anonymous INTEGER, "
+            "entry_type TEXT, timestamp TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_value ON entries(value)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries(timestamp)")
+        self._db.executemany(
+            "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._db_row(entry) for entry in self.entries.values())
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _db_row(entry: LedgerEntry) -> tuple:
+        """Flatten an entry into a row for the SQLite index"""
+        return (entry.entry_id, entry.transaction_id, entry.sender_wallet_id,
+                entry.receiver_wallet_id, entry.token_id, entry.value,
+                int(entry.is_anonymous), entry.entry_type.value, entry.timestamp)
+
+    def _index_entry(self, entry: LedgerEntry):
+        """Register an entry in the secondary indexes and running aggregates"""
+        entry_id = entry.entry_id
+        self._by_wallet.setdefault(entry.sender_wallet_id, set()).add(entry_id)
+        self._by_wallet.setdefault(entry.receiver_wallet_id, set()).add(entry_id)
+        self._by_txid.setdefault(entry.transaction_id, set()).add(entry_id)
+        self._by_type[entry.entry_type].add(entry_id)
+        self._ids.append(entry_id)
+        self._values.append(entry.value)
+        self._timestamps.append(entry.timestamp)
+        self._total_value += entry.value
+        if entry.entry_type == LedgerEntryType.ANONYMOUS:
+            self._anonymous_value += entry.value
+        elif entry.entry_type == LedgerEntryType.NON_ANONYMOUS:
+            self._non_anonymous_value += entry.value
+        canonical = entry.to_json().encode()
+        self._running_hash = hashlib.blake2b(self._running_hash + canonical,
+                                             digest_size=32).digest()
     
     def _load_ledger(self):
-        """Load ledger from file if it exists"""
+        """Load the snapshot file, then replay the append-only log"""
         try:
             with open(self.ledger_file, 'r') as f:
                 data = json.load(f)
                 self.entries = {}
                 for entry_data in data.get('entries', []):
-                    entry = LedgerEntry(
-                        entry_id=entry_data['entry_id'],
-                        transaction_id=entry_data['transaction_id'],
-                        sender_wallet_id=entry_data['sender_wallet_id'],
-                        receiver_wallet_id=entry_data['receiver_wallet_id'],
-                        token_id=entry_data['token_id'],
-                        value=entry_data['value'],
-                        is_anonymous=entry_data['is_anonymous'],
-                        entry_type=LedgerEntryType(entry_data['entry_type']),
-                        timestamp=entry_data['timestamp'],
-                        metadata=entry_data.get('metadata', {})
-                    )
-                    self.entries[entry.entry_id] = entry
-                    self.entry_counter = max(self.entry_counter, int(entry.entry_id) + 1)
+                    self._add_loaded_entry(entry_data)
         except FileNotFoundError:
             # Create new ledger file
             self._save_ledger()
+
+        # Replay entries appended since the last snapshot/compaction
+        try:
+            with open(self.ledger_file + ".log", 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self._add_loaded_entry(json.loads(line))
+        except FileNotFoundError:
+            pass
+
+    def _add_loaded_entry(self, entry_data: Dict):
+        """Rebuild a LedgerEntry from serialized data and register it"""
+        entry = LedgerEntry(
+            entry_id=entry_data['entry_id'],
+            transaction_id=entry_data['transaction_id'],
+            sender_wallet_id=entry_data['sender_wallet_id'],
+            receiver_wallet_id=entry_data['receiver_wallet_id'],
+            token_id=entry_data['token_id'],
+            value=entry_data['value'],
+            is_anonymous=entry_data['is_anonymous'],
+            entry_type=LedgerEntryType(entry_data['entry_type']),
+            timestamp=entry_data['timestamp'],
+            metadata=entry_data.get('metadata', {})
+        )
+        self.entries[entry.entry_id] = entry
+        self._index_entry(entry)
+        self.entry_counter = max(self.entry_counter, int(entry.entry_id) + 1)
     
     def _save_ledger(self):
         """Save ledger to file"""
-        data = {
-            'ledger_info': {
-                'created': datetime.now().isoformat(),
-                'total_entries': len(self.entries),
-                'anonymous_count': len(self.get_anonymous_entries()),
-                'non_anonymous_count': len(self.get_non_anonymous_entries()),
-                'aml_flagged_count': len(self.get_aml_flagged_entries())
-            },
-            'entries': [entry.to_dict() for entry in self.entries.values()]
+        ledger_info = {
+            'created': datetime.now().isoformat(),
+            'total_entries': len(self.entries),
+            'anonymous_count': len(self._by_type[LedgerEntryType.ANONYMOUS]),
+            'non_anonymous_count': len(self._by_type[LedgerEntryType.NON_ANONYMOUS]),
+            'aml_flagged_count': len(self._by_type[LedgerEntryType.AML_FLAGGED])
         }
-        
-        with open(self.ledger_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        _write_export(self.ledger_file,
+                      {'ledger_info': ledger_info},
+                      {'entries': self.entries.values()})
     
     def store_transaction(self, transaction) -> str:
         """Store a transaction in the ledger"""
@@ -133,7 +292,7 @@ class LedgerManager:
             value=token_value,
             is_anonymous=transaction.is_anonymous,
             entry_type=entry_type,
-            timestamp=transaction.timestamp or datetime.now().isoformat(),
+            timestamp=transaction.timestamp or _iso_now(),
             metadata={
                 'voucher_id': transaction.voucher_id,
                 'status': transaction.status.value,
@@ -142,9 +301,51 @@ class LedgerManager:
         )
         
         self.entries[entry_id] = entry
-        self._save_ledger()
-        
+        self._index_entry(entry)
+
+        # Persistence happens off-thread; the insert path only enqueues
+        self._write_q.put(entry)
+
         return entry_id
+
+    def _writer_loop(self):
+        """Drain queued entries and persist them in batches
+
+        Runs on a daemon thread with its own SQLite connection; each
+        batch costs one log write and one database commit regardless of
+        how many entries it carries.
+        """
+        db = sqlite3.connect(self.ledger_file + ".db")
+        while True:
+            batch = [self._write_q.get()]
+            while True:
+                try:
+                    batch.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [item for item in batch if isinstance(item, LedgerEntry)]
+            if entries:
+                self._log_file.write(''.join(entry.to_json() + "\n" for entry in entries))
+                self._log_file.flush()
+                db.executemany("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               [self._db_row(entry) for entry in entries])
+                db.commit()
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def flush(self):
+        """Block until every queued entry is on disk"""
+        done = threading.Event()
+        self._write_q.put(done)
+        done.wait()
+
+    def compact(self):
+        """Fold the append-only log into the snapshot file"""
+        self.flush()
+        self._save_ledger()
+        self._log_file.seek(0)
+        self._log_file.truncate()
     
     def get_entry(self, entry_id: str) -> Optional[LedgerEntry]:
         """Get ledger entry by ID"""
@@ -152,137 +353,187 @@ class LedgerManager:
     
     def get_entries_by_transaction(self, transaction_id: str) -> List[LedgerEntry]:
         """Get all entries for a specific transaction"""
-        return [entry for entry in self.entries.values() 
-                if entry.transaction_id == transaction_id]
-    
+        return [self.entries[entry_id] for entry_id in self._by_txid.get(transaction_id, ())]
+
     def get_entries_by_wallet(self, wallet_id: str) -> List[LedgerEntry]:
         """Get all entries involving a wallet"""
-        return [entry for entry in self.entries.values() 
-                if entry.sender_wallet_id == wallet_id or entry.receiver_wallet_id == wallet_id]
-    
+        return [self.entries[entry_id] for entry_id in self._by_wallet.get(wallet_id, ())]
+
     def get_anonymous_entries(self) -> List[LedgerEntry]:
         """Get all anonymous entries"""
-        return [entry for entry in self.entries.values() 
-                if entry.entry_type == LedgerEntryType.ANONYMOUS]
-    
+        return [self.entries[entry_id] for entry_id in self._by_type[LedgerEntryType.ANONYMOUS]]
+
     def get_non_anonymous_entries(self) -> List[LedgerEntry]:
         """Get all non-anonymous entries"""
-        return [entry for entry in self.entries.values() 
-                if entry.entry_type == LedgerEntryType.NON_ANONYMOUS]
-    
+        return [self.entries[entry_id] for entry_id in self._by_type[LedgerEntryType.NON_ANONYMOUS]]
+
     def get_aml_flagged_entries(self) -> List[LedgerEntry]:
         """Get all AML-flagged entries"""
-        return [entry for entry in self.entries.values() 
-                if entry.entry_type == LedgerEntryType.AML_FLAGGED]
+        return [self.entries[entry_id] for entry_id in self._by_type[LedgerEntryType.AML_FLAGGED]]
+
+    def count_entries_by_type(self, entry_type: LedgerEntryType) -> int:
+        """Count entries of a type without materializing them"""
+        return len(self._by_type[entry_type])
+
+    _ROW_COLUMNS = ('entry_id', 'transaction_id', 'sender_wallet_id',
+                    'receiver_wallet_id', 'token_id', 'value',
+                    'is_anonymous', 'entry_type', 'timestamp')
+
+    def iter_entry_rows(self, min_value: int = None, max_value: int = None,
+                        start_date: str = None, end_date: str = None):
+        """Stream raw entry rows from the on-disk index
+
+        For audit scans over ledgers that outgrow RAM, this yields
+        plain row dicts straight from the SQLite cursor; pages are
+        loaded on demand by the OS and no LedgerEntry objects are
+        materialized.
+        """
+        # Persistence is asynchronous; drain the write queue so the
+        # mirror reflects every entry stored before this call
+        self.flush()
+        clauses = []
+        params = []
+        if min_value is not None and max_value is not None:
+            clauses.append("value BETWEEN ? AND ?")
+            params += [min_value, max_value]
+        if start_date is not None and end_date is not None:
+            clauses.append("timestamp BETWEEN ? AND ?")
+            params += [start_date, end_date]
+        sql = "SELECT " + ", ".join(self._ROW_COLUMNS) + " FROM entries"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        columns = self._ROW_COLUMNS
+        # A private connection, like the writer's: the stream may stay
+        # open across yields and must not hold the shared read lock
+        db = sqlite3.connect(self.ledger_file + ".db")
+        try:
+            for row in db.execute(sql, params):
+                yield dict(zip(columns, row))
+        finally:
+            db.close()
     
     def get_entries_by_value_range(self, min_value: int, max_value: int) -> List[LedgerEntry]:
         """Get entries within a value range"""
-        return [entry for entry in self.entries.values() 
-                if min_value <= entry.value <= max_value]
-    
+        self.flush()
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT entry_id FROM entries WHERE value BETWEEN ? AND ?",
+                (min_value, max_value)).fetchall()
+        return [self.entries[entry_id] for (entry_id,) in rows]
+
     def get_entries_by_date_range(self, start_date: str, end_date: str) -> List[LedgerEntry]:
         """Get entries within a date range"""
-        return [entry for entry in self.entries.values() 
-                if start_date <= entry.timestamp <= end_date]
+        self.flush()
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT entry_id FROM entries WHERE timestamp BETWEEN ? AND ?",
+                (start_date, end_date)).fetchall()
+        return [self.entries[entry_id] for (entry_id,) in rows]
     
     def get_ledger_statistics(self) -> Dict:
         """Get comprehensive ledger statistics"""
         total_entries = len(self.entries)
-        anonymous_entries = self.get_anonymous_entries()
-        non_anonymous_entries = self.get_non_anonymous_entries()
-        aml_flagged_entries = self.get_aml_flagged_entries()
-        
-        total_value = sum(entry.value for entry in self.entries.values())
-        anonymous_value = sum(entry.value for entry in anonymous_entries)
-        non_anonymous_value = sum(entry.value for entry in non_anonymous_entries)
-        
+        anonymous_count = len(self._by_type[LedgerEntryType.ANONYMOUS])
+        total_value = self._total_value
+        anonymous_value = self._anonymous_value
+
         return {
             'total_entries': total_entries,
-            'anonymous_entries': len(anonymous_entries),
-            'non_anonymous_entries': len(non_anonymous_entries),
-            'aml_flagged_entries': len(aml_flagged_entries),
+            'anonymous_entries': anonymous_count,
+            'non_anonymous_entries': len(self._by_type[LedgerEntryType.NON_ANONYMOUS]),
+            'aml_flagged_entries': len(self._by_type[LedgerEntryType.AML_FLAGGED]),
             'total_value': total_value,
             'anonymous_value': anonymous_value,
-            'non_anonymous_value': non_anonymous_value,
-            'anonymous_percentage': (len(anonymous_entries) / total_entries * 100) if total_entries > 0 else 0,
+            'non_anonymous_value': self._non_anonymous_value,
+            'anonymous_percentage': (anonymous_count / total_entries * 100) if total_entries > 0 else 0,
             'value_anonymous_percentage': (anonymous_value / total_value * 100) if total_value > 0 else 0
         }
     
-    def export_aml_loggable_transactions(self, filename: str = None) -> str:
+    def export_aml_loggable_transactions(self, filename: str = None,
+                                         compress: bool = False) -> str:
         """Export transactions that should be logged for AML purposes"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"aml_loggable_transactions_{timestamp}.json"
-        
+        if compress and not filename.endswith(".gz"):
+            filename += ".gz"
+
         # Get non-anonymous and AML-flagged entries
         aml_entries = self.get_non_anonymous_entries() + self.get_aml_flagged_entries()
-        
-        export_data = {
-            'export_timestamp': datetime.now().isoformat(),
-            'total_aml_entries': len(aml_entries),
-            'entries': [entry.to_dict() for entry in aml_entries]
-        }
-        
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
-        
+
+        _write_export(filename,
+                      {'export_timestamp': datetime.now().isoformat(),
+                       'total_aml_entries': len(aml_entries)},
+                      {'entries': aml_entries},
+                      compress=compress)
+
         return filename
     
-    def export_anonymous_volume_report(self, filename: str = None) -> str:
+    def export_anonymous_volume_report(self, filename: str = None,
+                                       compress: bool = False) -> str:
         """Export anonymous vs non-anonymous volume report"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"volume_report_{timestamp}.json"
-        
+        if compress and not filename.endswith(".gz"):
+            filename += ".gz"
+
         stats = self.get_ledger_statistics()
-        
-        report_data = {
-            'report_timestamp': datetime.now().isoformat(),
-            'statistics': stats,
-            'anonymous_entries': [entry.to_dict() for entry in self.get_anonymous_entries()],
-            'non_anonymous_entries': [entry.to_dict() for entry in self.get_non_anonymous_entries()]
-        }
-        
-        with open(filename, 'w') as f:
-            json.dump(report_data, f, indent=2)
-        
+
+        _write_export(filename,
+                      {'report_timestamp': datetime.now().isoformat(),
+                       'statistics': stats},
+                      {'anonymous_entries': self.get_anonymous_entries(),
+                       'non_anonymous_entries': self.get_non_anonymous_entries()},
+                      compress=compress)
+
         return filename
     
     def query_ledger(self, query_params: Dict) -> List[LedgerEntry]:
         """Query ledger with various filters"""
-        results = list(self.entries.values())
-        
-        # Filter by entry type
+        # Narrow with the secondary indexes first so the remaining
+        # predicates only run over the intersected shortlist
+        candidate_ids = None
         if 'entry_type' in query_params:
             entry_type = LedgerEntryType(query_params['entry_type'])
-            results = [entry for entry in results if entry.entry_type == entry_type]
-        
-        # Filter by wallet
+            candidate_ids = self._by_type[entry_type]
         if 'wallet_id' in query_params:
-            wallet_id = query_params['wallet_id']
-            results = [entry for entry in results 
-                      if entry.sender_wallet_id == wallet_id or entry.receiver_wallet_id == wallet_id]
-        
-        # Filter by value range
+            wallet_ids = self._by_wallet.get(query_params['wallet_id'], set())
+            candidate_ids = wallet_ids if candidate_ids is None else candidate_ids & wallet_ids
+
+        if candidate_ids is not None:
+            # Chain generators over the shortlist so only the final
+            # result list is allocated
+            it = (self.entries[entry_id] for entry_id in candidate_ids)
+            if 'min_value' in query_params and 'max_value' in query_params:
+                min_val = query_params['min_value']
+                max_val = query_params['max_value']
+                it = (entry for entry in it if min_val <= entry.value <= max_val)
+            if 'start_date' in query_params and 'end_date' in query_params:
+                start_date = query_params['start_date']
+                end_date = query_params['end_date']
+                it = (entry for entry in it if start_date <= entry.timestamp <= end_date)
+            return list(it)
+
+        # No index applies: scan the packed columns and only resolve
+        # entry objects for the rows that match
+        selected = range(len(self._ids))
         if 'min_value' in query_params and 'max_value' in query_params:
             min_val = query_params['min_value']
             max_val = query_params['max_value']
-            results = [entry for entry in results if min_val <= entry.value <= max_val]
-        
-        # Filter by date range
+            values = self._values
+            selected = [i for i in selected if min_val <= values[i] <= max_val]
         if 'start_date' in query_params and 'end_date' in query_params:
             start_date = query_params['start_date']
             end_date = query_params['end_date']
-            results = [entry for entry in results if start_date <= entry.timestamp <= end_date]
-        
-        return results
+            timestamps = self._timestamps
+            selected = [i for i in selected if start_date <= timestamps[i] <= end_date]
+        if isinstance(selected, range):
+            return list(self.entries.values())
+        ids = self._ids
+        return [self.entries[ids[i]] for i in selected]
     
     def get_ledger_hash(self) -> str:
         """Get cryptographic hash of the ledger for integrity verification"""
-        # Create a hash of all entries for integrity checking
-        entries_data = []
-        for entry in sorted(self.entries.values(), key=lambda x: x.entry_id):
-            entries_data.append(entry.to_dict())
-        
-        data_str = json.dumps(entries_data, sort_keys=True)
-        return hashlib.sha256(data_str.encode()).hexdigest() 
\ No newline at end of file
+        # Hash chain is advanced per insert, so this is O(1)
+        return self._running_hash.hex()
\ No newline at end of file
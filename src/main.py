@@ -6,72 +6,106 @@ Ties all components together and provides system-wide functionality
 import argparse
 import json
 from datetime import datetime
+from functools import cached_property
 from typing import Dict, List
 
-from wallet import WalletManager
-from token_system import TokenManager
-from voucher import VoucherManager
-from transaction import TransactionEngine
-from compliance import ComplianceManager
-from ledger import LedgerManager
-from offline import OfflineManager
-from zkp import ZKPManager
-from cli import PrivacyNetworkCLI
+# Status rows rendered by both the demo summary and --status; one
+# (label, template) pair per line keeps the formatting in one place
+_STATUS_ROWS = (
+    ('Wallets', '{wallets}'),
+    ('Tokens', '{tokens} (€{total_token_value})'),
+    ('Vouchers', '{vouchers} ({available_vouchers} available)'),
+    ('Transactions', '{transactions} ({anonymous_transactions} anonymous)'),
+    ('AML Flagged', '{aml_flagged}'),
+    ('Offline', '{offline_transactions} ({pending_offline} pending)'),
+    ('ZKP Proofs', '{zkp_proofs}'),
+)
+
+
+def _print_status(status: Dict):
+    """Render a status dict using the shared row table"""
+    for label, template in _STATUS_ROWS:
+        print(f"   {label}: {template.format(**status)}")
 
 
 class PrivacyNetworkSystem:
-    """Main system coordinator for the Privacy Network System"""
-    
+    """Main system coordinator for the Privacy Network System
+
+    Managers are built lazily: each accessor constructs its manager on
+    first use and wires exactly the references it depends on, so a
+    command only pays for the subsystems it actually touches.
+    """
+
     def __init__(self):
-        """Initialize all system components"""
+        """Initialize the system; managers are created on first use"""
         print("Initializing Euromask...")
-        
-        # Initialize all managers
-        self.wallet_manager = WalletManager()
-        self.token_manager = TokenManager()
-        self.voucher_manager = VoucherManager()
-        self.compliance_manager = ComplianceManager()
-        self.ledger_manager = LedgerManager()
-        self.offline_manager = OfflineManager()
-        self.zkp_manager = ZKPManager()
-        self.transaction_engine = TransactionEngine()
-        
-        # Set up cross-references between managers
-        self._setup_manager_references()
-        
         print("System initialized successfully!")
-    
-    def _setup_manager_references(self):
-        """Set up cross-references between managers"""
-        # Set wallet manager references
-        self.token_manager.set_wallet_manager(self.wallet_manager)
-        self.voucher_manager.set_wallet_manager(self.wallet_manager)
-        
-        # Set manager references for transaction engine
-        self.transaction_engine.set_managers(
+
+    @cached_property
+    def wallet_manager(self):
+        from wallet import WalletManager
+        return WalletManager()
+
+    @cached_property
+    def token_manager(self):
+        from token_system import TokenManager
+        manager = TokenManager()
+        manager.set_wallet_manager(self.wallet_manager)
+        return manager
+
+    @cached_property
+    def voucher_manager(self):
+        from voucher import VoucherManager
+        manager = VoucherManager()
+        manager.set_wallet_manager(self.wallet_manager)
+        return manager
+
+    @cached_property
+    def compliance_manager(self):
+        from compliance import ComplianceManager
+        return ComplianceManager()
+
+    @cached_property
+    def ledger_manager(self):
+        from ledger import LedgerManager
+        manager = LedgerManager()
+        manager.token_manager = self.token_manager
+        return manager
+
+    @cached_property
+    def offline_manager(self):
+        from offline import OfflineManager
+        manager = OfflineManager()
+        manager.bind(
             self.wallet_manager,
             self.token_manager,
             self.voucher_manager,
-            self.compliance_manager,
             self.ledger_manager
         )
-        
-        # Set manager references for offline manager
-        self.offline_manager.set_managers(
+        return manager
+
+    @cached_property
+    def zkp_manager(self):
+        from zkp import ZKPManager
+        manager = ZKPManager()
+        manager.set_managers(
+            self.wallet_manager,
+            self.token_manager
+        )
+        return manager
+
+    @cached_property
+    def transaction_engine(self):
+        from transaction import TransactionEngine
+        engine = TransactionEngine()
+        engine.set_managers(
             self.wallet_manager,
             self.token_manager,
             self.voucher_manager,
+            self.compliance_manager,
             self.ledger_manager
         )
-        
-        # Set manager references for ZKP manager
-        self.zkp_manager.set_managers(
-            self.wallet_manager,
-            self.token_manager
-        )
-        
-        # Set token manager reference for ledger manager
-        self.ledger_manager.token_manager = self.token_manager
+        return engine
     
     def run_demo(self):
         """Run a comprehensive demonstration of the system"""
@@ -135,57 +169,38 @@ class PrivacyNetworkSystem:
         except Exception as e:
             print(f"Demo failed: {e}")
     
+    def _status_dict(self) -> Dict:
+        """Build the status snapshot from the managers' running counters
+
+        Every figure is an O(1) read; nothing rebuilds or filters the
+        underlying collections.
+        """
+        tokens, total_token_value = self.token_manager.count_and_total()
+        vouchers, available_vouchers = self.voucher_manager.count_and_available()
+        transactions, anonymous_transactions = self.transaction_engine.count_and_anonymous()
+        offline_txs, pending_offline = self.offline_manager.count_and_pending()
+
+        return {
+            'wallets': self.wallet_manager.count_wallets(),
+            'tokens': tokens,
+            'total_token_value': total_token_value,
+            'vouchers': vouchers,
+            'available_vouchers': available_vouchers,
+            'transactions': transactions,
+            'anonymous_transactions': anonymous_transactions,
+            'aml_flagged': self.compliance_manager.count_aml_entries(),
+            'offline_transactions': offline_txs,
+            'pending_offline': pending_offline,
+            'zkp_proofs': self.zkp_manager.count_proofs()
+        }
+
     def _show_system_status(self):
         """Show comprehensive system status"""
-        wallets = self.wallet_manager.list_wallets()
-        tokens = self.token_manager.list_all_tokens()
-        vouchers = self.voucher_manager.list_all_vouchers()
-        transactions = self.transaction_engine.list_all_transactions()
-        aml_entries = self.compliance_manager.get_aml_entries()
-        offline_txs = self.offline_manager.list_all_offline_transactions()
-        zkp_proofs = self.zkp_manager.list_all_proofs()
-        
-        total_token_value = sum(token.value for token in tokens)
-        available_vouchers = self.voucher_manager.get_unused_vouchers()
-        anonymous_transactions = self.transaction_engine.get_anonymous_transactions()
-        pending_offline = self.offline_manager.get_pending_offline_transactions()
-        
-        print(f"   Wallets: {len(wallets)}")
-        print(f"   Tokens: {len(tokens)} (€{total_token_value})")
-        print(f"   Vouchers: {len(vouchers)} ({len(available_vouchers)} available)")
-        print(f"   Transactions: {len(transactions)} ({len(anonymous_transactions)} anonymous)")
-        print(f"   AML Flagged: {len(aml_entries)}")
-        print(f"   Offline: {len(offline_txs)} ({len(pending_offline)} pending)")
-        print(f"   ZKP Proofs: {len(zkp_proofs)}")
-    
+        _print_status(self._status_dict())
+
     def get_system_status(self) -> Dict:
         """Get comprehensive system status"""
-        wallets = self.wallet_manager.list_wallets()
-        tokens = self.token_manager.list_all_tokens()
-        vouchers = self.voucher_manager.list_all_vouchers()
-        transactions = self.transaction_engine.list_all_transactions()
-        aml_entries = self.compliance_manager.get_aml_entries()
-        offline_txs = self.offline_manager.list_all_offline_transactions()
-        zkp_proofs = self.zkp_manager.list_all_proofs()
-        
-        total_token_value = sum(token.value for token in tokens)
-        available_vouchers = self.voucher_manager.get_unused_vouchers()
-        anonymous_transactions = self.transaction_engine.get_anonymous_transactions()
-        pending_offline = self.offline_manager.get_pending_offline_transactions()
-        
-        return {
-            'wallets': len(wallets),
-            'tokens': len(tokens),
-            'total_token_value': total_token_value,
-            'vouchers': len(vouchers),
-            'available_vouchers': len(available_vouchers),
-            'transactions': len(transactions),
-            'anonymous_transactions': len(anonymous_transactions),
-            'aml_flagged': len(aml_entries),
-            'offline_transactions': len(offline_txs),
-            'pending_offline': len(pending_offline),
-            'zkp_proofs': len(zkp_proofs)
-        }
+        return self._status_dict()
     
     def export_system_data(self) -> Dict[str, str]:
         """Export all system data to JSON files"""
@@ -226,6 +241,7 @@ class PrivacyNetworkSystem:
     
     def run_cli(self):
         """Run the interactive command-line interface"""
+        from cli import PrivacyNetworkCLI
         cli = PrivacyNetworkCLI(self)
         cli.run()
 
@@ -260,14 +276,7 @@ Examples:
     if args.status:
         print("\nSystem Status:")
         print("=" * 30)
-        status = system.get_system_status()
-        print(f"   Wallets: {status['wallets']}")
-        print(f"   Tokens: {status['tokens']} (€{status['total_token_value']})")
-        print(f"   Vouchers: {status['vouchers']} ({status['available_vouchers']} available)")
-        print(f"   Transactions: {status['transactions']} ({status['anonymous_transactions']} anonymous)")
-        print(f"   AML Flagged: {status['aml_flagged']}")
-        print(f"   Offline: {status['offline_transactions']} ({status['pending_offline']} pending)")
-        print(f"   ZKP Proofs: {status['zkp_proofs']}")
+        _print_status(system.get_system_status())
     
     if args.export:
         system.export_system_data()
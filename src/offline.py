@@ -3,11 +3,12 @@ Offline Transfer Simulation
 Handles peer-to-peer transactions without immediate ledger access
 """
 
-import uuid
+from os import urandom
 import hashlib
 import json
+import time
 from typing import Dict, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -20,7 +21,46 @@ class OfflineStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+# ISO timestamps are cached per wall-clock second: transactions created
+# or synced within the same second share one immutable string
+_ts_cache = [0, '']
+
+
+def _now_iso() -> str:
+    """Current time as an ISO string, cached at second resolution"""
+    second = int(time.time())
+    if second != _ts_cache[0]:
+        _ts_cache[0] = second
+        _ts_cache[1] = datetime.fromtimestamp(second).isoformat()
+    return _ts_cache[1]
+
+
+class _CompletedStatus:
+    """Fixed status object exposing the .value the ledger expects"""
+    __slots__ = ()
+    value = 'completed'
+
+
+# Built once; every synced offline transaction reports the same status
+_COMPLETED_STATUS = _CompletedStatus()
+
+
+@dataclass(slots=True)
+class _LedgerAdapter:
+    """Transaction-shaped view of an offline transaction for ledger storage"""
+    transaction_id: str
+    sender_wallet_id: str
+    receiver_wallet_id: str
+    token_id: str
+    voucher_id: Optional[str]
+    is_anonymous: bool
+    timestamp: Optional[str]
+    aml_flagged: bool = False
+    aml_reason: Optional[str] = None
+    status: object = _COMPLETED_STATUS
+
+
+@dataclass(slots=True)
 class OfflineTransaction:
     """Offline transaction between peers"""
     offline_id: str
@@ -35,70 +75,104 @@ class OfflineTransaction:
     synced_timestamp: Optional[str] = None
     voucher_id: Optional[str] = None
     is_anonymous: bool = False
-    
+    short_id: str = field(init=False, repr=False)
+    _static_dict: Dict = field(init=False, repr=False)
+    _signing_payload: Optional[Dict] = field(init=False, repr=False, default=None)
+
     def __post_init__(self):
         """Initialize offline transaction"""
         if not self.created_timestamp:
-            self.created_timestamp = datetime.now().isoformat()
-    
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for serialization"""
-        return {
+            self.created_timestamp = _now_iso()
+        # Truncated ID computed once; display code renders it constantly
+        self.short_id = self.offline_id[:8]
+        # Fields below never change after construction; cache them so
+        # repeated serialization only patches in the mutable ones
+        self._static_dict = {
             'offline_id': self.offline_id,
             'sender_wallet_id': self.sender_wallet_id,
             'receiver_wallet_id': self.receiver_wallet_id,
             'token_id': self.token_id,
             'value': self.value,
-            'sender_signature': self.sender_signature,
-            'receiver_signature': self.receiver_signature,
-            'status': self.status.value,
             'created_timestamp': self.created_timestamp,
-            'synced_timestamp': self.synced_timestamp,
             'voucher_id': self.voucher_id,
             'is_anonymous': self.is_anonymous
         }
 
+    @property
+    def signing_payload(self) -> Dict:
+        """Dict both parties sign over; every field is fixed at
+        construction, so it is built once on first verification"""
+        if self._signing_payload is None:
+            self._signing_payload = {
+                'offline_id': self.offline_id,
+                'sender_wallet_id': self.sender_wallet_id,
+                'receiver_wallet_id': self.receiver_wallet_id,
+                'token_id': self.token_id,
+                'value': self.value,
+                'voucher_id': self.voucher_id,
+                'is_anonymous': self.is_anonymous
+            }
+        return self._signing_payload
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for serialization"""
+        return {
+            **self._static_dict,
+            'sender_signature': self.sender_signature,
+            'receiver_signature': self.receiver_signature,
+            'status': self.status.value,
+            'synced_timestamp': self.synced_timestamp
+        }
+
 
 class OfflineManager:
     """Manages offline transactions and synchronization"""
     
     def __init__(self):
         self.offline_transactions: Dict[str, OfflineTransaction] = {}
+        # Per-status id sets; transactions move between them on every
+        # status transition so status queries never scan the full dict
+        self._by_status: Dict[OfflineStatus, set] = {status: set() for status in OfflineStatus}
+        # Wallet index populated on creation and trimmed on discard
+        self._by_wallet: Dict[str, set] = {}
+        # Free list of discarded transaction objects; create reuses them
+        # to skip dataclass construction in high-throughput runs
+        self._pool: List[OfflineTransaction] = []
+        # Manager references are injected once via bind() before any
+        # transaction is created, so the hot paths skip None guards
         self.wallet_manager = None
         self.token_manager = None
         self.voucher_manager = None
         self.ledger_manager = None
-    
-    def set_managers(self, wallet_manager, token_manager, voucher_manager, ledger_manager):
-        """Set references to managers"""
+
+    def bind(self, wallet_manager, token_manager, voucher_manager, ledger_manager):
+        """Inject the manager references in one call"""
         self.wallet_manager = wallet_manager
         self.token_manager = token_manager
         self.voucher_manager = voucher_manager
         self.ledger_manager = ledger_manager
+
+    # Backwards-compatible alias for the old wiring entry point
+    set_managers = bind
     
     def create_offline_transaction(self, sender_wallet_id: str, receiver_wallet_id: str,
                                  token_id: str, voucher_id: Optional[str] = None) -> OfflineTransaction:
         """Create a new offline transaction"""
         
-        # Validate inputs
-        if not all([sender_wallet_id, receiver_wallet_id, token_id]):
+        # Validate inputs; plain short-circuit 'and' avoids the list
+        # all() would build on every call
+        if not (sender_wallet_id and receiver_wallet_id and token_id):
             raise ValueError("Sender, receiver, and token ID are required")
         
         if sender_wallet_id == receiver_wallet_id:
             raise ValueError("Sender and receiver cannot be the same")
         
         # Check if wallets exist
-        if not self.wallet_manager:
-            raise ValueError("Wallet manager not set")
-        
-        if not (self.wallet_manager.wallet_exists(sender_wallet_id) and 
+        if not (self.wallet_manager.wallet_exists(sender_wallet_id) and
                 self.wallet_manager.wallet_exists(receiver_wallet_id)):
             raise ValueError("One or both wallets do not exist")
         
         # Check if token exists and is owned by sender
-        if not self.token_manager:
-            raise ValueError("Token manager not set")
-        
         token = self.token_manager.get_token(token_id)
         if not token:
             raise ValueError(f"Token {token_id} does not exist")
@@ -109,9 +183,6 @@ class OfflineManager:
         # Check voucher if provided
         is_anonymous = False
         if voucher_id:
-            if not self.voucher_manager:
-                raise ValueError("Voucher manager not set")
-            
             voucher = self.voucher_manager.get_voucher(voucher_id)
             if not voucher:
                 raise ValueError(f"Voucher {voucher_id} does not exist")
@@ -124,20 +195,47 @@ class OfflineManager:
             
             is_anonymous = True
         
-        # Create offline transaction
-        offline_id = str(uuid.uuid4())
-        offline_tx = OfflineTransaction(
-            offline_id=offline_id,
-            sender_wallet_id=sender_wallet_id,
-            receiver_wallet_id=receiver_wallet_id,
-            token_id=token_id,
-            value=token.value,
-            voucher_id=voucher_id,
-            is_anonymous=is_anonymous
-        )
-        
+        # Create offline transaction, reusing a pooled object when one
+        # is available so the hot path skips dataclass construction
+        offline_id = urandom(16).hex()
+        if self._pool:
+            offline_tx = self._pool.pop()
+            offline_tx.offline_id = offline_id
+            offline_tx.sender_wallet_id = sender_wallet_id
+            offline_tx.receiver_wallet_id = receiver_wallet_id
+            offline_tx.token_id = token_id
+            offline_tx.value = token.value
+            offline_tx.sender_signature = None
+            offline_tx.receiver_signature = None
+            offline_tx.status = OfflineStatus.PENDING
+            offline_tx.created_timestamp = None
+            offline_tx.synced_timestamp = None
+            offline_tx.voucher_id = voucher_id
+            offline_tx.is_anonymous = is_anonymous
+            offline_tx._signing_payload = None
+            offline_tx.__post_init__()  # refresh timestamp and cached dicts
+        else:
+            offline_tx = OfflineTransaction(
+                offline_id=offline_id,
+                sender_wallet_id=sender_wallet_id,
+                receiver_wallet_id=receiver_wallet_id,
+                token_id=token_id,
+                value=token.value,
+                voucher_id=voucher_id,
+                is_anonymous=is_anonymous
+            )
+
         self.offline_transactions[offline_id] = offline_tx
+        self._by_status[OfflineStatus.PENDING].add(offline_id)
+        self._by_wallet.setdefault(sender_wallet_id, set()).add(offline_id)
+        self._by_wallet.setdefault(receiver_wallet_id, set()).add(offline_id)
         return offline_tx
+
+    def _set_status(self, offline_tx: OfflineTransaction, new_status: OfflineStatus):
+        """Move a transaction to a new status and its status bucket"""
+        self._by_status[offline_tx.status].discard(offline_tx.offline_id)
+        offline_tx.status = new_status
+        self._by_status[new_status].add(offline_tx.offline_id)
     
     def sign_offline_transaction(self, offline_id: str, wallet_id: str, signature: str) -> bool:
         """Sign an offline transaction (simulated dual signature)"""
@@ -159,32 +257,18 @@ class OfflineManager:
         
         # Check if both signatures are present
         if offline_tx.sender_signature and offline_tx.receiver_signature:
-            offline_tx.status = OfflineStatus.SIGNED
-        
+            self._set_status(offline_tx, OfflineStatus.SIGNED)
+
         return True
     
     def _verify_offline_signature(self, offline_tx: OfflineTransaction, wallet_id: str, signature: str) -> bool:
         """Verify offline transaction signature (simulated)"""
-        if not self.wallet_manager:
-            return False
-        
         wallet = self.wallet_manager.get_wallet(wallet_id)
         if not wallet:
             return False
         
-        # Create transaction data for signature verification
-        tx_data = {
-            'offline_id': offline_tx.offline_id,
-            'sender_wallet_id': offline_tx.sender_wallet_id,
-            'receiver_wallet_id': offline_tx.receiver_wallet_id,
-            'token_id': offline_tx.token_id,
-            'value': offline_tx.value,
-            'voucher_id': offline_tx.voucher_id,
-            'is_anonymous': offline_tx.is_anonymous
-        }
-        
-        # Simulate signature verification
-        expected_signature = wallet.sign_transaction(tx_data)
+        # Simulate signature verification over the cached payload
+        expected_signature = wallet.sign_transaction(offline_tx.signing_payload)
         return signature == expected_signature
     
     def sync_with_ledger(self, offline_id: str) -> bool:
@@ -199,9 +283,6 @@ class OfflineManager:
         
         try:
             # Transfer token ownership
-            if not self.token_manager:
-                return False
-            
             transfer_success = self.token_manager.transfer_token(
                 offline_tx.token_id, 
                 offline_tx.sender_wallet_id, 
@@ -209,114 +290,131 @@ class OfflineManager:
             )
             
             if not transfer_success:
-                offline_tx.status = OfflineStatus.FAILED
+                self._set_status(offline_tx, OfflineStatus.FAILED)
                 return False
             
             # Redeem voucher if used
-            if offline_tx.voucher_id and self.voucher_manager:
+            if offline_tx.voucher_id:
                 voucher_redeemed = self.voucher_manager.redeem_voucher(
                     offline_tx.voucher_id, 
                     offline_tx.offline_id, 
                     offline_tx.value
                 )
                 if not voucher_redeemed:
-                    offline_tx.status = OfflineStatus.FAILED
+                    self._set_status(offline_tx, OfflineStatus.FAILED)
                     return False
             
             # Create ledger entry
-            if self.ledger_manager:
-                # Create a transaction-like object for ledger storage
-                class MockTransaction:
-                    def __init__(self, offline_tx):
-                        self.transaction_id = offline_tx.offline_id
-                        self.sender_wallet_id = offline_tx.sender_wallet_id
-                        self.receiver_wallet_id = offline_tx.receiver_wallet_id
-                        self.token_id = offline_tx.token_id
-                        self.voucher_id = offline_tx.voucher_id
-                        self.is_anonymous = offline_tx.is_anonymous
-                        self.aml_flagged = False
-                        self.aml_reason = None
-                        self.timestamp = offline_tx.created_timestamp
-                        self.status = type('Status', (), {'value': 'completed'})()
-                
-                mock_tx = MockTransaction(offline_tx)
-                self.ledger_manager.store_transaction(mock_tx)
+            self.ledger_manager.store_transaction(_LedgerAdapter(
+                transaction_id=offline_tx.offline_id,
+                sender_wallet_id=offline_tx.sender_wallet_id,
+                receiver_wallet_id=offline_tx.receiver_wallet_id,
+                token_id=offline_tx.token_id,
+                voucher_id=offline_tx.voucher_id,
+                is_anonymous=offline_tx.is_anonymous,
+                timestamp=offline_tx.created_timestamp
+            ))
             
             # Mark as synced
-            offline_tx.status = OfflineStatus.SYNCED
-            offline_tx.synced_timestamp = datetime.now().isoformat()
+            self._set_status(offline_tx, OfflineStatus.SYNCED)
+            offline_tx.synced_timestamp = _now_iso()
             
             return True
             
         except Exception as e:
-            offline_tx.status = OfflineStatus.FAILED
+            self._set_status(offline_tx, OfflineStatus.FAILED)
             return False
     
+    def discard_offline_transaction(self, offline_id: str) -> bool:
+        """Drop a transaction and return its object to the reuse pool"""
+        offline_tx = self.offline_transactions.pop(offline_id, None)
+        if not offline_tx:
+            return False
+        self._by_status[offline_tx.status].discard(offline_id)
+        self._by_wallet.get(offline_tx.sender_wallet_id, set()).discard(offline_id)
+        self._by_wallet.get(offline_tx.receiver_wallet_id, set()).discard(offline_id)
+        self._pool.append(offline_tx)
+        return True
+
     def get_offline_transaction(self, offline_id: str) -> Optional[OfflineTransaction]:
         """Get offline transaction by ID"""
         return self.offline_transactions.get(offline_id)
     
+    def _by(self, status: OfflineStatus):
+        """Lazily yield transactions in one status bucket; callers that
+        only need counts use len(self._by_status[status]) instead"""
+        return (self.offline_transactions[offline_id]
+                for offline_id in self._by_status[status])
+
     def get_pending_offline_transactions(self) -> List[OfflineTransaction]:
         """Get all pending offline transactions"""
-        return [tx for tx in self.offline_transactions.values() 
-                if tx.status == OfflineStatus.PENDING]
-    
+        return list(self._by(OfflineStatus.PENDING))
+
     def get_signed_offline_transactions(self) -> List[OfflineTransaction]:
         """Get all signed offline transactions ready for sync"""
-        return [tx for tx in self.offline_transactions.values() 
-                if tx.status == OfflineStatus.SIGNED]
-    
+        return list(self._by(OfflineStatus.SIGNED))
+
     def get_synced_offline_transactions(self) -> List[OfflineTransaction]:
         """Get all synced offline transactions"""
-        return [tx for tx in self.offline_transactions.values() 
-                if tx.status == OfflineStatus.SYNCED]
-    
+        return list(self._by(OfflineStatus.SYNCED))
+
     def get_failed_offline_transactions(self) -> List[OfflineTransaction]:
         """Get all failed offline transactions"""
-        return [tx for tx in self.offline_transactions.values() 
-                if tx.status == OfflineStatus.FAILED]
+        return list(self._by(OfflineStatus.FAILED))
     
     def get_offline_transactions_by_wallet(self, wallet_id: str) -> List[OfflineTransaction]:
         """Get all offline transactions involving a wallet"""
-        return [tx for tx in self.offline_transactions.values() 
-                if tx.sender_wallet_id == wallet_id or tx.receiver_wallet_id == wallet_id]
+        return [self.offline_transactions[offline_id]
+                for offline_id in self._by_wallet.get(wallet_id, ())]
     
     def list_all_offline_transactions(self) -> List[OfflineTransaction]:
         """List all offline transactions"""
         return list(self.offline_transactions.values())
     
+    def count_and_pending(self) -> tuple:
+        """Offline transaction count and pending count, both O(1)"""
+        return len(self.offline_transactions), len(self._by_status[OfflineStatus.PENDING])
+    
     def get_offline_statistics(self) -> Dict:
-        """Get offline transaction statistics"""
-        total_transactions = len(self.offline_transactions)
-        pending_transactions = self.get_pending_offline_transactions()
-        signed_transactions = self.get_signed_offline_transactions()
-        synced_transactions = self.get_synced_offline_transactions()
-        failed_transactions = self.get_failed_offline_transactions()
-        
+        """Get offline transaction statistics
+
+        All counts come straight from the status buckets, so this never
+        materializes transaction lists.
+        """
+        total = len(self.offline_transactions)
+        synced = len(self._by_status[OfflineStatus.SYNCED])
+        failed = len(self._by_status[OfflineStatus.FAILED])
+
         return {
-            'total_offline_transactions': total_transactions,
-            'pending_transactions': len(pending_transactions),
-            'signed_transactions': len(signed_transactions),
-            'synced_transactions': len(synced_transactions),
-            'failed_transactions': len(failed_transactions),
-            'sync_rate': (len(synced_transactions) / total_transactions * 100) if total_transactions > 0 else 0,
-            'failure_rate': (len(failed_transactions) / total_transactions * 100) if total_transactions > 0 else 0
+            'total_offline_transactions': total,
+            'pending_transactions': len(self._by_status[OfflineStatus.PENDING]),
+            'signed_transactions': len(self._by_status[OfflineStatus.SIGNED]),
+            'synced_transactions': synced,
+            'failed_transactions': failed,
+            'sync_rate': (synced / total * 100) if total > 0 else 0,
+            'failure_rate': (failed / total * 100) if total > 0 else 0
         }
     
     def export_offline_transactions(self, filename: str = None) -> str:
         """Export offline transactions to JSON file"""
+        # One clock read serves both the filename and the export header
+        now = datetime.now()
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"offline_transactions_{timestamp}.json"
-        
-        export_data = {
-            'export_timestamp': datetime.now().isoformat(),
-            'total_transactions': len(self.offline_transactions),
-            'statistics': self.get_offline_statistics(),
-            'transactions': [tx.to_dict() for tx in self.offline_transactions.values()]
-        }
-        
+            filename = f"offline_transactions_{now.strftime('%Y%m%d_%H%M%S')}.json"
+
+        # Stream transactions one at a time instead of materializing
+        # every to_dict() result and the full document in memory
+        statistics = self.get_offline_statistics()
         with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
-        
+            f.write('{\n')
+            f.write(f'  "export_timestamp": {json.dumps(now.isoformat())},\n')
+            f.write(f'  "total_transactions": {statistics["total_offline_transactions"]},\n')
+            f.write(f'  "statistics": {json.dumps(statistics)},\n')
+            f.write('  "transactions": [\n')
+            separator = ''
+            for tx in self.offline_transactions.values():
+                f.write(separator + '    ' + json.dumps(tx.to_dict()))
+                separator = ',\n'
+            f.write('\n  ]\n}\n')
+
         return filename 
\ No newline at end of file
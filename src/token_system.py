@@ -3,9 +3,9 @@ Token Representation and Issuance System
 Handles token creation, ownership, and transfer
 """
 
-import uuid
+from os import urandom
 from typing import Dict, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -19,7 +19,12 @@ class TokenValue(Enum):
     HUNDRED_EURO = 100
 
 
-@dataclass
+# Denomination check as a single hash probe; built once instead of
+# walking the enum members per call
+_VALID_DENOMS = frozenset(v.value for v in TokenValue)
+
+
+@dataclass(slots=True)
 class Token:
     """Digital token representing monetary value"""
     token_id: str
@@ -27,12 +32,23 @@ class Token:
     owner_wallet_id: str
     issued_by: str = "ECB"  # Issuing authority
     issue_timestamp: Optional[str] = None
-    
+    short_id: str = field(init=False, repr=False)
+    _static_dict: Dict = field(init=False, repr=False)
+
     def __post_init__(self):
         """Validate token after creation"""
         if not self.token_id or self.value <= 0 or not self.owner_wallet_id:
             raise ValueError("Token must have valid ID, positive value, and owner")
-    
+        # Truncated ID computed once; display code renders it constantly
+        self.short_id = self.token_id[:8]
+        # Only the owner changes after issuance; cache the rest
+        self._static_dict = {
+            'token_id': self.token_id,
+            'value': self.value,
+            'issued_by': self.issued_by,
+            'issue_timestamp': self.issue_timestamp
+        }
+
     def transfer_ownership(self, new_owner_wallet_id: str) -> bool:
         """Transfer token ownership to new wallet"""
         if new_owner_wallet_id:
@@ -42,13 +58,7 @@ class Token:
     
     def to_dict(self) -> Dict:
         """Convert token to dictionary for serialization"""
-        return {
-            'token_id': self.token_id,
-            'value': self.value,
-            'owner_wallet_id': self.owner_wallet_id,
-            'issued_by': self.issued_by,
-            'issue_timestamp': self.issue_timestamp
-        }
+        return {**self._static_dict, 'owner_wallet_id': self.owner_wallet_id}
 
 
 class TokenManager:
@@ -57,17 +67,33 @@ class TokenManager:
     def __init__(self):
         self.tokens: Dict[str, Token] = {}
         self.wallet_manager = None  # Will be set by main system
+        self._total_value = 0  # Running sum of issued token values
+        # Owner index and per-wallet value cache, maintained on issue
+        # and transfer so balance queries avoid full-token scans
+        self._tokens_by_owner: Dict[str, set] = {}
+        self._value_by_owner: Dict[str, int] = {}
     
     def set_wallet_manager(self, wallet_manager):
         """Set reference to wallet manager"""
         self.wallet_manager = wallet_manager
     
-    def issue_token(self, value: int, owner_wallet_id: str) -> Token:
-        """Issue new token to a wallet (mock ECB issuing)"""
+    def issue_token(self, value: int, owner_wallet_id: str,
+                    enforce_denomination: bool = False) -> Token:
+        """Issue new token to a wallet (mock ECB issuing)
+
+        With enforce_denomination, only standard TokenValue amounts are
+        accepted; the default stays permissive because demos and tests
+        issue arbitrary amounts (e.g. €10000 for AML checks).
+        """
+        if enforce_denomination and value not in _VALID_DENOMS:
+            raise ValueError(f"€{value} is not a standard token denomination")
+
         if not self.wallet_manager or not self.wallet_manager.wallet_exists(owner_wallet_id):
             raise ValueError(f"Wallet {owner_wallet_id} does not exist")
-        
-        token_id = str(uuid.uuid4())
+
+        # Raw random hex; nothing depends on RFC 4122 structure and this
+        # skips the UUID object construction on the issuing hot path
+        token_id = urandom(16).hex()
         token = Token(
             token_id=token_id,
             value=value,
@@ -75,6 +101,9 @@ class TokenManager:
         )
         
         self.tokens[token_id] = token
+        self._total_value += token.value
+        self._tokens_by_owner.setdefault(owner_wallet_id, set()).add(token_id)
+        self._value_by_owner[owner_wallet_id] = self._value_by_owner.get(owner_wallet_id, 0) + token.value
         
         # Add token to wallet balance
         wallet = self.wallet_manager.get_wallet(owner_wallet_id)
@@ -115,19 +144,34 @@ class TokenManager:
         if receiver_wallet:
             receiver_wallet.add_token(token_id)
         
-        # Update token ownership
+        # Update token ownership and move it between owner indexes
+        self._tokens_by_owner[sender_wallet_id].discard(token_id)
+        self._tokens_by_owner.setdefault(receiver_wallet_id, set()).add(token_id)
+        self._value_by_owner[sender_wallet_id] -= token.value
+        self._value_by_owner[receiver_wallet_id] = self._value_by_owner.get(receiver_wallet_id, 0) + token.value
         token.transfer_ownership(receiver_wallet_id)
-        
+
         return True
-    
+
     def get_tokens_by_owner(self, wallet_id: str) -> List[Token]:
         """Get all tokens owned by a wallet"""
-        return [token for token in self.tokens.values() if token.owner_wallet_id == wallet_id]
+        return [self.tokens[token_id] for token_id in self._tokens_by_owner.get(wallet_id, ())]
+    
+    def group_tokens_by_owner(self) -> Dict[str, List[Token]]:
+        """Group all tokens by owner wallet in a single pass"""
+        grouped: Dict[str, List[Token]] = {}
+        for token in self.tokens.values():
+            grouped.setdefault(token.owner_wallet_id, []).append(token)
+        return grouped
     
     def get_total_value_by_owner(self, wallet_id: str) -> int:
         """Get total token value owned by a wallet"""
-        return sum(token.value for token in self.get_tokens_by_owner(wallet_id))
+        return self._value_by_owner.get(wallet_id, 0)
     
     def list_all_tokens(self) -> List[Token]:
         """List all tokens in the system"""
-        return list(self.tokens.values()) 
\ No newline at end of file
+        return list(self.tokens.values())
+    
+    def count_and_total(self) -> tuple:
+        """Token count and total issued value, both O(1)"""
+        return len(self.tokens), self._total_value 
\ No newline at end of file
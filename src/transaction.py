@@ -6,9 +6,9 @@ Handles token transfers with ownership verification and AML routing
 import uuid
 import hashlib
 import json
+import time
 from typing import Dict, Optional, List
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -20,7 +20,46 @@ class TransactionStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Second-resolution prefix cached between calls; only the microsecond
+# suffix is formatted per transaction, skipping the datetime machinery
+_ISO_CACHE = [0, '']
+
+
+def _now_iso() -> str:
+    """Current time as an ISO string with microseconds"""
+    ns = time.time_ns()
+    sec = ns // 1_000_000_000
+    if sec != _ISO_CACHE[0]:
+        _ISO_CACHE[0] = sec
+        _ISO_CACHE[1] = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(sec))
+    return f"{_ISO_CACHE[1]}.{(ns % 1_000_000_000) // 1000:06d}"
+
+
+def build_tx_canonical(tx: 'Transaction') -> bytes:
+    """Serialize the fields a signature covers into canonical bytes
+
+    Fixed field order with a 0x1F separator; only fields that are
+    immutable after construction are included, so a signature stays
+    verifiable after the status changes. Avoids the dict + json.dumps
+    round-trip on the signing hot path.
+    """
+    return b'\x1f'.join((
+        tx.transaction_id.encode(),
+        tx.sender_wallet_id.encode(),
+        tx.receiver_wallet_id.encode(),
+        tx.token_id.encode(),
+        (tx.voucher_id or '').encode(),
+        b'1' if tx.is_anonymous else b'0',
+        tx.timestamp.encode(),
+    ))
+
+
+# Fields that may change after construction; any write to one of these
+# invalidates the memoized to_dict() result
+_TX_MUTABLE_FIELDS = frozenset(('status', 'aml_flagged', 'aml_reason', 'signature'))
+
+
+@dataclass(slots=True)
 class Transaction:
     """Digital transaction between wallets"""
     transaction_id: str
@@ -34,27 +73,48 @@ class Transaction:
     aml_flagged: bool = False
     aml_reason: Optional[str] = None
     signature: Optional[str] = None
-    
+    short_id: str = field(init=False, repr=False)
+    _canonical: bytes = field(init=False, repr=False)
+    _dict_cache: Optional[Dict] = field(init=False, repr=False, default=None)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in _TX_MUTABLE_FIELDS:
+            object.__setattr__(self, '_dict_cache', None)
+
     def __post_init__(self):
         """Initialize transaction after creation"""
         if not self.timestamp:
-            self.timestamp = datetime.now().isoformat()
+            self.timestamp = _now_iso()
+        # Truncated ID computed once; display code renders it constantly
+        self.short_id = self.transaction_id[:8]
+        # Canonical signing bytes; every covered field is fixed at
+        # construction, so sign and verify reuse the same buffer
+        self._canonical = build_tx_canonical(self)
     
     def to_dict(self) -> Dict:
-        """Convert transaction to dictionary"""
-        return {
-            'transaction_id': self.transaction_id,
-            'sender_wallet_id': self.sender_wallet_id,
-            'receiver_wallet_id': self.receiver_wallet_id,
-            'token_id': self.token_id,
-            'voucher_id': self.voucher_id,
-            'is_anonymous': self.is_anonymous,
-            'status': self.status.value,
-            'timestamp': self.timestamp,
-            'aml_flagged': self.aml_flagged,
-            'aml_reason': self.aml_reason,
-            'signature': self.signature
-        }
+        """Convert transaction to dictionary
+
+        Memoized; the cache is invalidated whenever a mutable field
+        (status, AML flags, signature) is written.
+        """
+        cached = self._dict_cache
+        if cached is None:
+            cached = {
+                'transaction_id': self.transaction_id,
+                'sender_wallet_id': self.sender_wallet_id,
+                'receiver_wallet_id': self.receiver_wallet_id,
+                'token_id': self.token_id,
+                'voucher_id': self.voucher_id,
+                'is_anonymous': self.is_anonymous,
+                'status': self.status.value,
+                'timestamp': self.timestamp,
+                'aml_flagged': self.aml_flagged,
+                'aml_reason': self.aml_reason,
+                'signature': self.signature
+            }
+            self._dict_cache = cached
+        return cached
 
 
 class TransactionEngine:
@@ -62,6 +122,12 @@ class TransactionEngine:
     
     def __init__(self):
         self.transactions: Dict[str, Transaction] = {}
+        # Secondary indexes maintained when a transaction is stored, so
+        # the query methods never scan the full transaction dict
+        self._by_wallet: Dict[str, set] = {}
+        self._by_status: Dict[TransactionStatus, set] = {status: set() for status in TransactionStatus}
+        self._anon: set = set()
+        self._aml: set = set()
         self.wallet_manager = None
         self.token_manager = None
         self.voucher_manager = None
@@ -87,20 +153,29 @@ class TransactionEngine:
         
         if sender_wallet_id == receiver_wallet_id:
             raise ValueError("Sender and receiver cannot be the same")
-        
+
+        # Hoist manager references into locals once; the body below
+        # touches them repeatedly and LOAD_FAST beats LOAD_ATTR
+        wallet_manager = self.wallet_manager
+        token_manager = self.token_manager
+        voucher_manager = self.voucher_manager
+
         # Check if wallets exist
-        if not self.wallet_manager:
+        if not wallet_manager:
             raise ValueError("Wallet manager not set")
-        
-        if not (self.wallet_manager.wallet_exists(sender_wallet_id) and 
-                self.wallet_manager.wallet_exists(receiver_wallet_id)):
+
+        # One dict probe per wallet; the sender object is reused below
+        # for signing instead of being looked up again
+        sender_wallet = wallet_manager.get_wallet(sender_wallet_id)
+        receiver_wallet = wallet_manager.get_wallet(receiver_wallet_id)
+        if sender_wallet is None or receiver_wallet is None:
             raise ValueError("One or both wallets do not exist")
         
         # Check if token exists and is owned by sender
-        if not self.token_manager:
+        if not token_manager:
             raise ValueError("Token manager not set")
-        
-        token = self.token_manager.get_token(token_id)
+
+        token = token_manager.get_token(token_id)
         if not token:
             raise ValueError(f"Token {token_id} does not exist")
         
@@ -110,10 +185,10 @@ class TransactionEngine:
         # Determine if transaction is anonymous
         is_anonymous = False
         if voucher_id:
-            if not self.voucher_manager:
+            if not voucher_manager:
                 raise ValueError("Voucher manager not set")
-            
-            voucher = self.voucher_manager.get_voucher(voucher_id)
+
+            voucher = voucher_manager.get_voucher(voucher_id)
             if not voucher:
                 raise ValueError(f"Voucher {voucher_id} does not exist")
             
@@ -121,14 +196,16 @@ class TransactionEngine:
             if voucher.issued_to_wallet_id != sender_wallet_id:
                 raise ValueError(f"Voucher {voucher_id} does not belong to sender")
             
-            # Check if voucher can be used for this transaction
-            if not voucher.can_be_used_for_value(token.value):
+            # Check if voucher can be used for this transaction;
+            # inlined form of can_be_used_for_value to skip the method
+            # dispatch on the transfer hot path
+            if voucher.is_used or token.value > voucher.value_limit:
                 raise ValueError(f"Voucher {voucher_id} cannot be used for value €{token.value}")
             
             is_anonymous = True
         
         # Create transaction
-        transaction_id = str(uuid.uuid4())
+        transaction_id = uuid.uuid4().hex
         transaction = Transaction(
             transaction_id=transaction_id,
             sender_wallet_id=sender_wallet_id,
@@ -147,7 +224,7 @@ class TransactionEngine:
         # Execute the transfer
         try:
             # Transfer token ownership
-            transfer_success = self.token_manager.transfer_token(
+            transfer_success = token_manager.transfer_token(
                 token_id, sender_wallet_id, receiver_wallet_id
             )
             
@@ -156,19 +233,16 @@ class TransactionEngine:
                 raise ValueError("Token transfer failed")
             
             # Redeem voucher if used
-            if voucher_id and self.voucher_manager:
-                voucher_redeemed = self.voucher_manager.redeem_voucher(
+            if voucher_id and voucher_manager:
+                voucher_redeemed = voucher_manager.redeem_voucher(
                     voucher_id, transaction_id, token.value
                 )
                 if not voucher_redeemed:
                     transaction.status = TransactionStatus.FAILED
                     raise ValueError("Voucher redemption failed")
             
-            # Sign transaction (simulated)
-            if self.wallet_manager:
-                sender_wallet = self.wallet_manager.get_wallet(sender_wallet_id)
-                if sender_wallet:
-                    transaction.signature = sender_wallet.sign_transaction(transaction.to_dict())
+            # Sign transaction (simulated) over the canonical bytes
+            transaction.signature = sender_wallet.sign_bytes(transaction._canonical)
             
             # Mark transaction as completed
             transaction.status = TransactionStatus.COMPLETED
@@ -177,66 +251,93 @@ class TransactionEngine:
             if self.ledger_manager:
                 self.ledger_manager.store_transaction(transaction)
             
-            # Store transaction
+            # Store transaction and index it
             self.transactions[transaction_id] = transaction
-            
+            self._by_status[transaction.status].add(transaction_id)
+            self._by_wallet.setdefault(sender_wallet_id, set()).add(transaction_id)
+            self._by_wallet.setdefault(receiver_wallet_id, set()).add(transaction_id)
+            if transaction.is_anonymous:
+                self._anon.add(transaction_id)
+            if transaction.aml_flagged:
+                self._aml.add(transaction_id)
+
             return transaction
             
         except Exception as e:
             transaction.status = TransactionStatus.FAILED
             raise e
     
+    def flush(self):
+        """Block until every transferred transaction is durably persisted
+
+        store_transaction only enqueues to the ledger's background
+        writer, so the transfer hot path never waits on I/O; callers
+        that need a commit barrier (shutdown, audits) use this.
+        """
+        if self.ledger_manager:
+            self.ledger_manager.flush()
+
     def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
         """Get transaction by ID"""
         return self.transactions.get(transaction_id)
     
+    def _select(self, tx_ids):
+        """Lazily yield the transactions behind an ID index; callers that
+        only need counts read the index sizes instead"""
+        return (self.transactions[tx_id] for tx_id in tx_ids)
+
     def get_transactions_by_wallet(self, wallet_id: str) -> List[Transaction]:
         """Get all transactions involving a wallet"""
-        return [tx for tx in self.transactions.values() 
-                if tx.sender_wallet_id == wallet_id or tx.receiver_wallet_id == wallet_id]
-    
+        return list(self._select(self._by_wallet.get(wallet_id, ())))
+
     def get_anonymous_transactions(self) -> List[Transaction]:
         """Get all anonymous transactions"""
-        return [tx for tx in self.transactions.values() if tx.is_anonymous]
-    
+        return list(self._select(self._anon))
+
     def get_non_anonymous_transactions(self) -> List[Transaction]:
         """Get all non-anonymous transactions"""
-        return [tx for tx in self.transactions.values() if not tx.is_anonymous]
-    
+        return [tx for tx_id, tx in self.transactions.items() if tx_id not in self._anon]
+
     def get_aml_flagged_transactions(self) -> List[Transaction]:
         """Get all AML-flagged transactions"""
-        return [tx for tx in self.transactions.values() if tx.aml_flagged]
-    
+        return list(self._select(self._aml))
+
     def get_completed_transactions(self) -> List[Transaction]:
         """Get all completed transactions"""
-        return [tx for tx in self.transactions.values() if tx.status == TransactionStatus.COMPLETED]
-    
+        return list(self._select(self._by_status[TransactionStatus.COMPLETED]))
+
     def get_failed_transactions(self) -> List[Transaction]:
         """Get all failed transactions"""
-        return [tx for tx in self.transactions.values() if tx.status == TransactionStatus.FAILED]
+        return list(self._select(self._by_status[TransactionStatus.FAILED]))
     
     def list_all_transactions(self) -> List[Transaction]:
         """List all transactions"""
         return list(self.transactions.values())
     
+    def count_and_anonymous(self) -> tuple:
+        """Transaction count and anonymous count, both O(1)"""
+        return len(self.transactions), len(self._anon)
+    
     def get_transaction_statistics(self) -> Dict:
-        """Get transaction statistics"""
-        total_transactions = len(self.transactions)
-        anonymous_transactions = self.get_anonymous_transactions()
-        non_anonymous_transactions = self.get_non_anonymous_transactions()
-        aml_flagged_transactions = self.get_aml_flagged_transactions()
-        completed_transactions = self.get_completed_transactions()
-        failed_transactions = self.get_failed_transactions()
-        
+        """Get transaction statistics
+
+        All counts come straight from the index sets; no transaction
+        lists are materialized.
+        """
+        total = len(self.transactions)
+        anonymous = len(self._anon)
+        completed = len(self._by_status[TransactionStatus.COMPLETED])
+        failed = len(self._by_status[TransactionStatus.FAILED])
+
         return {
-            'total_transactions': total_transactions,
-            'anonymous_transactions': len(anonymous_transactions),
-            'non_anonymous_transactions': len(non_anonymous_transactions),
-            'aml_flagged_transactions': len(aml_flagged_transactions),
-            'completed_transactions': len(completed_transactions),
-            'failed_transactions': len(failed_transactions),
-            'success_rate': (len(completed_transactions) / total_transactions * 100) if total_transactions > 0 else 0,
-            'anonymous_percentage': (len(anonymous_transactions) / total_transactions * 100) if total_transactions > 0 else 0
+            'total_transactions': total,
+            'anonymous_transactions': anonymous,
+            'non_anonymous_transactions': total - anonymous,
+            'aml_flagged_transactions': len(self._aml),
+            'completed_transactions': completed,
+            'failed_transactions': failed,
+            'success_rate': (completed / total * 100) if total > 0 else 0,
+            'anonymous_percentage': (anonymous / total * 100) if total > 0 else 0
         }
     
     def verify_transaction_signature(self, transaction_id: str) -> bool:
@@ -252,8 +353,5 @@ class TransactionEngine:
         if not sender_wallet:
             return False
         
-        # Create transaction data without signature for verification
-        transaction_data = transaction.to_dict()
-        transaction_data.pop('signature', None)
-        
-        return sender_wallet.verify_signature(transaction_data, transaction.signature) 
\ No newline at end of file
+        # The signature covers the canonical immutable fields only
+        return sender_wallet.verify_bytes(transaction._canonical, transaction.signature)
\ No newline at end of file
@@ -5,13 +5,18 @@ Handles anonymity vouchers for private transactions
 
 import uuid
 import hashlib
-import json
+import hmac
 from typing import Dict, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+# Hash state pre-seeded with the invariant signature header; each
+# signing call copies it instead of re-hashing the shared prefix
+_SIG_BASE = hashlib.sha256(b'pns-voucher-sig-v1')
+
+
+@dataclass(slots=True)
 class Voucher:
     """Anonymity voucher for private transactions"""
     voucher_id: str
@@ -22,11 +27,17 @@ class Voucher:
     issue_timestamp: Optional[str] = None
     is_used: bool = False
     used_in_transaction: Optional[str] = None
-    
+    short_id: str = field(init=False, repr=False)
+    # Expected signature memoized on first verification; voucher fields
+    # are immutable after issuance, so it never needs recomputing
+    _expected_sig: Optional[str] = field(init=False, repr=False, default=None)
+
     def __post_init__(self):
         """Validate voucher after creation"""
         if not self.voucher_id or not self.signature or self.value_limit <= 0:
             raise ValueError("Voucher must have valid ID, signature, and positive value limit")
+        # Truncated ID computed once; display code renders it constantly
+        self.short_id = self.voucher_id[:8]
     
     def can_be_used_for_value(self, value: int) -> bool:
         """Check if voucher can be used for given transaction value"""
@@ -61,6 +72,15 @@ class VoucherManager:
         self.vouchers: Dict[str, Voucher] = {}
         self.wallet_manager = None  # Will be set by main system
         self.aml_authority_private_key = "aml_authority_secret_key_123"  # Mock private key
+        # Pre-encoded once; the signer feeds it via update() so OpenSSL's
+        # accelerated sha256 path sees bytes, never a fresh concat string
+        self._aml_key_bytes = self.aml_authority_private_key.encode()
+        # IDs of unused vouchers; doubles as the availability counter and
+        # lets the used/unused getters skip full scans
+        self._unused_ids: set = set()
+        # Per-wallet voucher lists, appended on issue; vouchers are never
+        # deleted, so the index only grows
+        self._vouchers_by_wallet: Dict[str, List[Voucher]] = {}
     
     def set_wallet_manager(self, wallet_manager):
         """Set reference to wallet manager"""
@@ -68,16 +88,25 @@ class VoucherManager:
     
     def _generate_aml_signature(self, voucher_data: Dict) -> str:
         """Generate mock AML Authority signature"""
-        data_str = json.dumps(voucher_data, sort_keys=True)
-        signature = hashlib.sha256((data_str + self.aml_authority_private_key).encode()).hexdigest()
-        return signature
+        # Copy the pre-seeded state, then hash only the per-voucher tail
+        # in fixed field order followed by the authority key
+        h = _SIG_BASE.copy()
+        h.update('\x1f'.join((
+            voucher_data['voucher_id'],
+            str(voucher_data['value_limit']),
+            voucher_data['issued_to_wallet_id'],
+            voucher_data['issued_by'],
+            voucher_data['issue_timestamp'] or '',
+        )).encode())
+        h.update(self._aml_key_bytes)
+        return h.hexdigest()
     
     def issue_voucher(self, wallet_id: str, value_limit: int) -> Voucher:
         """Issue a voucher to a wallet (mock AML Authority)"""
         if not self.wallet_manager or not self.wallet_manager.wallet_exists(wallet_id):
             raise ValueError(f"Wallet {wallet_id} does not exist")
         
-        voucher_id = str(uuid.uuid4())
+        voucher_id = uuid.uuid4().hex
         voucher_data = {
             'voucher_id': voucher_id,
             'value_limit': value_limit,
@@ -97,6 +126,8 @@ class VoucherManager:
         )
         
         self.vouchers[voucher_id] = voucher
+        self._unused_ids.add(voucher_id)
+        self._vouchers_by_wallet.setdefault(wallet_id, []).append(voucher)
         
         # Add voucher to wallet
         wallet = self.wallet_manager.get_wallet(wallet_id)
@@ -121,6 +152,7 @@ class VoucherManager:
         
         # Mark voucher as used
         if voucher.mark_as_used(transaction_id):
+            self._unused_ids.discard(voucher_id)
             # Remove voucher from wallet
             wallet = self.wallet_manager.get_wallet(voucher.issued_to_wallet_id)
             if wallet:
@@ -135,26 +167,26 @@ class VoucherManager:
         if not voucher:
             return False
         
-        # Recreate voucher data for verification
-        voucher_data = {
-            'voucher_id': voucher.voucher_id,
-            'value_limit': voucher.value_limit,
-            'issued_to_wallet_id': voucher.issued_to_wallet_id,
-            'issued_by': voucher.issued_by,
-            'issue_timestamp': voucher.issue_timestamp
-        }
-        
-        expected_signature = self._generate_aml_signature(voucher_data)
-        return voucher.signature == expected_signature
+        # Recompute the expected signature once, then audit sweeps reduce
+        # to a constant-time comparison against the memoized value
+        if voucher._expected_sig is None:
+            voucher._expected_sig = self._generate_aml_signature({
+                'voucher_id': voucher.voucher_id,
+                'value_limit': voucher.value_limit,
+                'issued_to_wallet_id': voucher.issued_to_wallet_id,
+                'issued_by': voucher.issued_by,
+                'issue_timestamp': voucher.issue_timestamp
+            })
+
+        return hmac.compare_digest(voucher.signature, voucher._expected_sig)
     
     def get_vouchers_by_wallet(self, wallet_id: str) -> List[Voucher]:
         """Get all vouchers issued to a wallet"""
-        return [voucher for voucher in self.vouchers.values() 
-                if voucher.issued_to_wallet_id == wallet_id]
-    
+        return list(self._vouchers_by_wallet.get(wallet_id, ()))
+
     def get_available_vouchers_by_wallet(self, wallet_id: str) -> List[Voucher]:
         """Get available (unused) vouchers for a wallet"""
-        return [voucher for voucher in self.get_vouchers_by_wallet(wallet_id) 
+        return [voucher for voucher in self._vouchers_by_wallet.get(wallet_id, ())
                 if not voucher.is_used]
     
     def list_all_vouchers(self) -> List[Voucher]:
@@ -163,8 +195,13 @@ class VoucherManager:
     
     def get_used_vouchers(self) -> List[Voucher]:
         """Get all used vouchers"""
-        return [voucher for voucher in self.vouchers.values() if voucher.is_used]
-    
+        return [voucher for voucher_id, voucher in self.vouchers.items()
+                if voucher_id not in self._unused_ids]
+
     def get_unused_vouchers(self) -> List[Voucher]:
         """Get all unused vouchers"""
-        return [voucher for voucher in self.vouchers.values() if not voucher.is_used] 
\ No newline at end of file
+        return [self.vouchers[voucher_id] for voucher_id in self._unused_ids]
+
+    def count_and_available(self) -> tuple:
+        """Voucher count and available (unused) count, both O(1)"""
+        return len(self.vouchers), len(self._unused_ids) 
\ No newline at end of file
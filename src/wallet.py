@@ -5,35 +5,56 @@ Handles wallet creation, key management, and transaction signing
 
 import uuid
 import hashlib
+import hmac
 import secrets
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from dataclasses import dataclass, field
 import json
 
 
-@dataclass
+@dataclass(slots=True)
 class Wallet:
-    """Digital wallet for storing tokens and vouchers"""
+    """Digital wallet for storing tokens and vouchers
+
+    Keys are held as raw bytes; the hex forms exist only as on-demand
+    properties for display and serialization.
+    """
     wallet_id: str
-    public_key: str
-    private_key: str
-    token_balance: List[str] = field(default_factory=list)  # List of token IDs
+    public_key_bytes: bytes
+    private_key_bytes: bytes
+    token_balance: Set[str] = field(default_factory=set)  # Owned token IDs
     voucher_balance: int = 0
-    
+    short_id: str = field(init=False, repr=False)
+    _hmac_template: object = field(init=False, repr=False)
+
     def __post_init__(self):
         """Validate wallet after creation"""
-        if not self.wallet_id or not self.public_key or not self.private_key:
+        if not self.wallet_id or not self.public_key_bytes or not self.private_key_bytes:
             raise ValueError("Wallet must have valid ID, public key, and private key")
+        # Truncated ID computed once; display code renders it constantly
+        self.short_id = self.wallet_id[:8]
+        # HMAC state with the key's ipad/opad already absorbed; each
+        # signature copies it instead of rekeying
+        self._hmac_template = hmac.new(self.private_key_bytes, None, 'sha256')
+
+    @property
+    def public_key(self) -> str:
+        """Hex form of the public key"""
+        return self.public_key_bytes.hex()
+
+    @property
+    def private_key(self) -> str:
+        """Hex form of the private key"""
+        return self.private_key_bytes.hex()
     
     def add_token(self, token_id: str) -> None:
         """Add a token to wallet balance"""
-        if token_id not in self.token_balance:
-            self.token_balance.append(token_id)
-    
+        self.token_balance.add(token_id)
+
     def remove_token(self, token_id: str) -> bool:
         """Remove a token from wallet balance"""
         if token_id in self.token_balance:
-            self.token_balance.remove(token_id)
+            self.token_balance.discard(token_id)
             return True
         return False
     
@@ -48,25 +69,40 @@ class Wallet:
             return True
         return False
     
+    def sign_bytes(self, data: bytes) -> str:
+        """Sign a canonical byte payload with the private key (simulated)
+
+        Hot-path variant for callers that already hold canonical bytes
+        (see transaction.build_tx_canonical); skips all serialization.
+        """
+        h = self._hmac_template.copy()
+        h.update(data)
+        return h.hexdigest()
+
+    def verify_bytes(self, data: bytes, signature: str) -> bool:
+        """Verify a signature over a canonical byte payload"""
+        return signature == self.sign_bytes(data)
+
     def sign_transaction(self, transaction_data: Dict) -> str:
         """Sign transaction data with private key (simulated)"""
-        # In a real implementation, this would use proper cryptographic signing
-        data_str = json.dumps(transaction_data, sort_keys=True)
-        signature = hashlib.sha256((data_str + self.private_key).encode()).hexdigest()
-        return signature
-    
+        # In a real implementation, this would use proper cryptographic
+        # signing; sign_bytes copies the prepared HMAC-SHA256 template,
+        # so the key is never re-absorbed or appended per call.
+        # Compact separators keep the canonical form as small as the
+        # stdlib encoder can emit it.
+        return self.sign_bytes(
+            json.dumps(transaction_data, sort_keys=True, separators=(',', ':')).encode())
+
     def verify_signature(self, data: Dict, signature: str) -> bool:
         """Verify signature using public key (simulated)"""
-        data_str = json.dumps(data, sort_keys=True)
-        expected_signature = hashlib.sha256((data_str + self.private_key).encode()).hexdigest()
-        return signature == expected_signature
+        return signature == self.sign_transaction(data)
     
     def to_dict(self) -> Dict:
         """Convert wallet to dictionary for serialization"""
         return {
             'wallet_id': self.wallet_id,
             'public_key': self.public_key,
-            'token_balance': self.token_balance,
+            'token_balance': sorted(self.token_balance),  # deterministic order
             'voucher_balance': self.voucher_balance
             # Note: private_key is not included for security
         }
@@ -80,16 +116,19 @@ class WalletManager:
     
     def create_wallet(self) -> Wallet:
         """Create a new wallet with cryptographic keypair"""
-        wallet_id = str(uuid.uuid4())
-        
-        # Generate cryptographic keypair (simulated)
-        private_key = secrets.token_hex(32)
-        public_key = hashlib.sha256(private_key.encode()).hexdigest()
+        # .hex skips the dashed str() formatting; 32 chars hash faster
+        # and every caller keeps exchanging plain string IDs
+        wallet_id = uuid.uuid4().hex
         
+        # Generate cryptographic keypair (simulated); keys stay raw
+        # bytes end to end — no hex/encode round-trip before hashing
+        private_key = secrets.token_bytes(32)
+        public_key = hashlib.sha256(private_key).digest()
+
         wallet = Wallet(
             wallet_id=wallet_id,
-            public_key=public_key,
-            private_key=private_key
+            public_key_bytes=public_key,
+            private_key_bytes=private_key
         )
         
         self.wallets[wallet_id] = wallet
@@ -103,6 +142,10 @@ class WalletManager:
         """List all wallets"""
         return list(self.wallets.values())
     
+    def count_wallets(self) -> int:
+        """Count wallets without materializing a list"""
+        return len(self.wallets)
+    
     def wallet_exists(self, wallet_id: str) -> bool:
         """Check if wallet exists"""
         return wallet_id in self.wallets 
\ No newline at end of file
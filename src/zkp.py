@@ -3,11 +3,13 @@ Zero-Knowledge Proof (ZKP) System
 Mock implementation of ZKP for privacy verification
 """
 
-import uuid
 import hashlib
 import json
+import time
+from functools import partial
+from os import urandom
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
@@ -20,7 +22,122 @@ class ZKPType(Enum):
     BALANCE_PROOF = "balance_proof"
 
 
-@dataclass
+# Single binding for every commitment hash in this module. The
+# commitments are mock values with no external algorithm contract, so
+# they use BLAKE2b like the ledger's hash chain: faster than software
+# SHA-256 on these short inputs, and still a stdlib hashlib object, so
+# the copy()/update() state-reuse patterns below are unchanged. The
+# digest is capped at 32 bytes to keep the hex strings sha256-sized.
+_hash = partial(hashlib.blake2b, digest_size=32)
+
+# ISO timestamps are cached per wall-clock second: proofs generated or
+# verified within the same second share one immutable string
+_ts_cache = [0, '']
+
+
+def _now_iso() -> str:
+    """Current time as an ISO string, cached at second resolution"""
+    second = int(time.time())
+    if second != _ts_cache[0]:
+        _ts_cache[0] = second
+        _ts_cache[1] = datetime.fromtimestamp(second).isoformat()
+    return _ts_cache[1]
+
+
+# Element labels pre-encoded once per proof shape; the derivation loop
+# feeds ready bytes straight into the hash lanes
+_RANGE_LABELS = (('A', b'A'), ('S', b'S'), ('T1', b'T1'), ('T2', b'T2'))
+_EQUALITY_LABELS = (('C', b'C'), ('D', b'D'))
+_MEMBERSHIP_LABELS = (('M', b'M'), ('N', b'N'))
+
+# Required element names per proof shape; verifiers test these with a
+# single C-level subset check rather than a per-element loop
+_RANGE_REQUIRED = frozenset(('A', 'S', 'T1', 'T2'))
+_EQUALITY_REQUIRED = frozenset(('C', 'D'))
+_MEMBERSHIP_REQUIRED = frozenset(('M', 'N'))
+
+
+def _derive_elements(proof_id: str, labels) -> Dict[str, str]:
+    """Derive mock commitment elements from one shared hash state
+
+    The proof ID is hashed once; each element copies that state and
+    appends only its pre-encoded domain-separator label, instead of
+    building and hashing a fresh f-string per element.
+    """
+    base = _hash(proof_id.encode())
+    elements = {}
+    for label, label_bytes in labels:
+        h = base.copy()
+        h.update(label_bytes)
+        elements[label] = h.hexdigest()
+    return elements
+
+
+@dataclass(slots=True)
+class RangeProofData:
+    """Range proof payload
+
+    Slot fields replace the nested parameter dict; the element map
+    stays a dict because its keys come from the label tables.
+    """
+    commitment: str
+    min_value: int
+    max_value: int
+    proof_elements: Dict[str, str]
+
+    def to_dict(self) -> Dict:
+        """Serialize in the legacy nested-dict layout"""
+        return {
+            'commitment': self.commitment,
+            'range_parameters': {
+                'min_value': self.min_value,
+                'max_value': self.max_value
+            },
+            'proof_elements': self.proof_elements
+        }
+
+
+@dataclass(slots=True)
+class EqualityProofData:
+    """Equality proof payload"""
+    commitment: str
+    expected_value: int
+    actual_value: int
+    proof_elements: Dict[str, str]
+
+    def to_dict(self) -> Dict:
+        """Serialize in the legacy nested-dict layout"""
+        return {
+            'commitment': self.commitment,
+            'equality_parameters': {
+                'expected_value': self.expected_value,
+                'actual_value': self.actual_value
+            },
+            'proof_elements': self.proof_elements
+        }
+
+
+@dataclass(slots=True)
+class MembershipProofData:
+    """Membership proof payload"""
+    commitment: str
+    wallet_token_count: int
+    requested_token_count: int
+    proof_elements: Dict[str, str]
+
+    def to_dict(self) -> Dict:
+        """Serialize in the legacy nested-dict layout"""
+        return {
+            'commitment': self.commitment,
+            'membership_parameters': {
+                'wallet_token_count': self.wallet_token_count,
+                'requested_token_count': self.requested_token_count
+            },
+            'proof_elements': self.proof_elements
+        }
+
+
+@dataclass(slots=True)
 class ZKPProof:
     """Zero-knowledge proof structure"""
     proof_id: str
@@ -32,11 +149,22 @@ class ZKPProof:
     created_timestamp: Optional[str] = None
     verified: bool = False
     verification_timestamp: Optional[str] = None
-    
+    short_id: str = field(init=False, repr=False)
+    # Wallet token IDs as a frozenset, cached for membership proofs so
+    # verification is one subset test instead of per-token list probes
+    _wallet_token_set: Optional[frozenset] = field(init=False, repr=False, default=None)
+    # Verifier-hot values as typed fields, populated at generation;
+    # None means the proof came from outside and verify falls back to
+    # the serialized dicts
+    _total_balance: Optional[int] = field(init=False, repr=False, default=None)
+    _actual_value: Optional[int] = field(init=False, repr=False, default=None)
+
     def __post_init__(self):
         """Initialize proof after creation"""
         if not self.created_timestamp:
-            self.created_timestamp = datetime.now().isoformat()
+            self.created_timestamp = _now_iso()
+        # Truncated ID computed once; display code renders it constantly
+        self.short_id = self.proof_id[:8]
     
     def to_dict(self) -> Dict:
         """Convert proof to dictionary for serialization"""
@@ -44,7 +172,7 @@ class ZKPProof:
             'proof_id': self.proof_id,
             'proof_type': self.proof_type.value,
             'statement': self.statement,
-            'proof_data': self.proof_data,
+            'proof_data': self.proof_data.to_dict(),
             'public_inputs': self.public_inputs,
             'private_inputs': self.private_inputs,
             'created_timestamp': self.created_timestamp,
@@ -60,6 +188,68 @@ class ZKPManager:
         self.proofs: Dict[str, ZKPProof] = {}
         self.wallet_manager = None
         self.token_manager = None
+        # Secondary indexes maintained at insert/verify time so the
+        # filter getters and statistics never scan the proof objects
+        self._by_type: Dict[ZKPType, set] = {t: set() for t in ZKPType}
+        self._verified_ids: set = set()
+        # Entropy pool refilled 4 KiB at a time; proof IDs slice 16
+        # bytes off the tail instead of paying one urandom call each
+        self._id_pool = bytearray()
+        # Range proofs dominate the demo workload and always share one
+        # statement shape; bake that shape into a generated builder
+        # (same technique as the compiled compliance scoring function)
+        self._build_range_proof = self._compile_range_builder()
+
+    @staticmethod
+    def _compile_range_builder():
+        """Partial-evaluate range-proof assembly into one function
+
+        The statement, public and private input shapes are fixed, so
+        the dict structure is baked into generated source with the hash
+        helpers, element labels, and proof type pre-bound as defaults —
+        the per-call body runs on local loads only.
+        """
+        source = (
+            "def build(proof_id, wallet_id, min_value, max_value, total_balance,\n"
+            "          token_details, hash_fn=_hash, derive=_derive_elements,\n"
+            "          labels=_RANGE_LABELS, proof_cls=ZKPProof,\n"
+            "          data_cls=RangeProofData,\n"
+            "          proof_type=ZKPType.RANGE_PROOF):\n"
+            "    proof = proof_cls(\n"
+            "        proof_id=proof_id,\n"
+            "        proof_type=proof_type,\n"
+            "        statement={'wallet_id': wallet_id, 'min_value': min_value,\n"
+            "                   'max_value': max_value, 'total_balance': total_balance},\n"
+            "        proof_data=data_cls(\n"
+            "            hash_fn(b'%s:%d' % (wallet_id.encode(), total_balance)).hexdigest(),\n"
+            "            min_value, max_value, derive(proof_id, labels)),\n"
+            "        public_inputs={'wallet_id': wallet_id, 'min_value': min_value,\n"
+            "                       'max_value': max_value},\n"
+            "        private_inputs={'token_details': token_details,\n"
+            "                        'total_balance': total_balance})\n"
+            "    proof._total_balance = total_balance\n"
+            "    return proof\n"
+        )
+        namespace = {'_hash': _hash, '_derive_elements': _derive_elements,
+                     '_RANGE_LABELS': _RANGE_LABELS, 'ZKPProof': ZKPProof,
+                     'RangeProofData': RangeProofData,
+                     'ZKPType': ZKPType}
+        exec(source, namespace)
+        return namespace['build']
+
+    def _next_id(self) -> str:
+        """Draw a 32-hex-char proof ID from the batched entropy pool"""
+        pool = self._id_pool
+        if not pool:
+            pool = self._id_pool = bytearray(urandom(4096))
+        raw = pool[-16:]
+        del pool[-16:]
+        return raw.hex()
+
+    def _store(self, proof: ZKPProof) -> None:
+        """Store a proof and index it by type"""
+        self.proofs[proof.proof_id] = proof
+        self._by_type[proof.proof_type].add(proof.proof_id)
     
     def set_managers(self, wallet_manager, token_manager):
         """Set references to managers"""
@@ -78,89 +268,70 @@ class ZKPManager:
         
         total_balance = 0
         token_details = []
-        
-        for token_id in wallet.token_balance:
-            if self.token_manager:
-                token = self.token_manager.get_token(token_id)
+
+        # The token manager keeps per-owner totals current on issuance
+        # and transfer, so the balance is an O(1) read; the per-token
+        # loop only runs to fill in the private token details
+        token_manager = self.token_manager
+        if token_manager:
+            total_balance = token_manager.get_total_value_by_owner(wallet_id)
+            get_token = token_manager.get_token
+            for token_id in wallet.token_balance:
+                token = get_token(token_id)
                 if token:
-                    total_balance += token.value
                     token_details.append({
                         'token_id': token_id,
                         'value': token.value
                     })
         
-        # Mock range proof generation
-        proof_id = str(uuid.uuid4())
-        proof_data = {
-            'commitment': hashlib.sha256(f"{wallet_id}:{total_balance}".encode()).hexdigest(),
-            'range_parameters': {
-                'min_value': min_value,
-                'max_value': max_value
-            },
-            'proof_elements': {
-                'A': hashlib.sha256(f"commitment_A:{proof_id}".encode()).hexdigest(),
-                'S': hashlib.sha256(f"commitment_S:{proof_id}".encode()).hexdigest(),
-                'T1': hashlib.sha256(f"commitment_T1:{proof_id}".encode()).hexdigest(),
-                'T2': hashlib.sha256(f"commitment_T2:{proof_id}".encode()).hexdigest()
-            }
-        }
-        
-        proof = ZKPProof(
-            proof_id=proof_id,
-            proof_type=ZKPType.RANGE_PROOF,
-            statement={
-                'wallet_id': wallet_id,
-                'min_value': min_value,
-                'max_value': max_value,
-                'total_balance': total_balance
-            },
-            proof_data=proof_data,
-            public_inputs={
-                'wallet_id': wallet_id,
-                'min_value': min_value,
-                'max_value': max_value
-            },
-            private_inputs={
-                'token_details': token_details,
-                'total_balance': total_balance
-            }
-        )
-        
-        self.proofs[proof_id] = proof
+        # Mock range proof generation; assembly runs in the generated
+        # builder with the statement shape and helpers baked in
+        proof = self._build_range_proof(
+            self._next_id(), wallet_id, min_value, max_value,
+            total_balance, token_details)
+
+        self._store(proof)
         return proof
     
+    def generate_range_proofs_bulk(self, wallet_ids: List[str],
+                                   min_value: int, max_value: int) -> List[ZKPProof]:
+        """Generate one range proof per wallet in a single batch
+
+        Stress and demo pipelines issue many proofs back to back; the
+        batch path binds the generator once so the loop pays no
+        attribute walks between proofs.
+        """
+        generate = self.generate_range_proof
+        return [generate(wallet_id, min_value, max_value)
+                for wallet_id in wallet_ids]
+
     def verify_range_proof(self, proof_id: str) -> bool:
         """Verify a range proof"""
         proof = self.proofs.get(proof_id)
         if not proof or proof.proof_type != ZKPType.RANGE_PROOF:
             return False
         
-        # Mock verification logic
-        try:
-            # Check if balance is within range
+        # Mock verification logic; the .get defaults make every read
+        # total, so no exception guard is needed
+        # Check if balance is within range; the typed field skips the
+        # dict lookup for proofs generated in-process
+        total_balance = proof._total_balance
+        if total_balance is None:
             total_balance = proof.private_inputs.get('total_balance', 0)
-            min_value = proof.statement.get('min_value', 0)
-            max_value = proof.statement.get('max_value', float('inf'))
-            
-            is_valid = min_value <= total_balance <= max_value
-            
-            # Verify proof elements (simulated)
-            proof_elements = proof.proof_data.get('proof_elements', {})
-            required_elements = ['A', 'S', 'T1', 'T2']
-            
-            for element in required_elements:
-                if element not in proof_elements:
-                    is_valid = False
-                    break
-            
-            if is_valid:
-                proof.verified = True
-                proof.verification_timestamp = datetime.now().isoformat()
-            
-            return is_valid
-            
-        except Exception:
-            return False
+        min_value = proof.statement.get('min_value', 0)
+        max_value = proof.statement.get('max_value', float('inf'))
+
+        is_valid = min_value <= total_balance <= max_value
+
+        # Verify proof elements (simulated)
+        is_valid = is_valid and _RANGE_REQUIRED.issubset(proof.proof_data.proof_elements)
+
+        if is_valid:
+            proof.verified = True
+            proof.verification_timestamp = _now_iso()
+            self._verified_ids.add(proof_id)
+
+        return is_valid
     
     def generate_equality_proof(self, wallet_id: str, token_id: str, expected_value: int) -> ZKPProof:
         """Generate an equality proof for token value"""
@@ -174,19 +345,18 @@ class ZKPManager:
         if token.owner_wallet_id != wallet_id:
             raise ValueError(f"Token {token_id} does not belong to wallet {wallet_id}")
         
+        # Read the token value once; the five uses below all load the
+        # local instead of walking the token object per site
+        token_value = token.value
+
         # Mock equality proof generation
-        proof_id = str(uuid.uuid4())
-        proof_data = {
-            'commitment': hashlib.sha256(f"{token_id}:{token.value}".encode()).hexdigest(),
-            'equality_parameters': {
-                'expected_value': expected_value,
-                'actual_value': token.value
-            },
-            'proof_elements': {
-                'C': hashlib.sha256(f"commitment_C:{proof_id}".encode()).hexdigest(),
-                'D': hashlib.sha256(f"commitment_D:{proof_id}".encode()).hexdigest()
-            }
-        }
+        proof_id = self._next_id()
+        proof_data = EqualityProofData(
+            commitment=_hash(b"%s:%d" % (token_id.encode(), token_value)).hexdigest(),
+            expected_value=expected_value,
+            actual_value=token_value,
+            proof_elements=_derive_elements(proof_id, _EQUALITY_LABELS)
+        )
         
         proof = ZKPProof(
             proof_id=proof_id,
@@ -195,7 +365,7 @@ class ZKPManager:
                 'wallet_id': wallet_id,
                 'token_id': token_id,
                 'expected_value': expected_value,
-                'actual_value': token.value
+                'actual_value': token_value
             },
             proof_data=proof_data,
             public_inputs={
@@ -204,11 +374,12 @@ class ZKPManager:
                 'expected_value': expected_value
             },
             private_inputs={
-                'actual_value': token.value
+                'actual_value': token_value
             }
         )
-        
-        self.proofs[proof_id] = proof
+        proof._actual_value = token_value
+
+        self._store(proof)
         return proof
     
     def verify_equality_proof(self, proof_id: str) -> bool:
@@ -217,30 +388,25 @@ class ZKPManager:
         if not proof or proof.proof_type != ZKPType.EQUALITY_PROOF:
             return False
         
-        # Mock verification logic
-        try:
-            expected_value = proof.statement.get('expected_value', 0)
+        # Mock verification logic; the .get defaults make every read
+        # total, so no exception guard is needed
+        expected_value = proof.statement.get('expected_value', 0)
+        # Typed field skips the dict lookup for in-process proofs
+        actual_value = proof._actual_value
+        if actual_value is None:
             actual_value = proof.statement.get('actual_value', 0)
-            
-            is_valid = expected_value == actual_value
-            
-            # Verify proof elements (simulated)
-            proof_elements = proof.proof_data.get('proof_elements', {})
-            required_elements = ['C', 'D']
-            
-            for element in required_elements:
-                if element not in proof_elements:
-                    is_valid = False
-                    break
-            
-            if is_valid:
-                proof.verified = True
-                proof.verification_timestamp = datetime.now().isoformat()
-            
-            return is_valid
-            
-        except Exception:
-            return False
+
+        is_valid = expected_value == actual_value
+
+        # Verify proof elements (simulated)
+        is_valid = is_valid and _EQUALITY_REQUIRED.issubset(proof.proof_data.proof_elements)
+
+        if is_valid:
+            proof.verified = True
+            proof.verification_timestamp = _now_iso()
+            self._verified_ids.add(proof_id)
+
+        return is_valid
     
     def generate_membership_proof(self, wallet_id: str, token_ids: List[str]) -> ZKPProof:
         """Generate a membership proof for wallet tokens"""
@@ -259,18 +425,20 @@ class ZKPManager:
             raise ValueError("Not all tokens belong to the specified wallet")
         
         # Mock membership proof generation
-        proof_id = str(uuid.uuid4())
-        proof_data = {
-            'commitment': hashlib.sha256(f"{wallet_id}:{','.join(sorted(token_ids))}".encode()).hexdigest(),
-            'membership_parameters': {
-                'wallet_token_count': len(wallet_token_ids),
-                'requested_token_count': len(requested_token_ids)
-            },
-            'proof_elements': {
-                'M': hashlib.sha256(f"commitment_M:{proof_id}".encode()).hexdigest(),
-                'N': hashlib.sha256(f"commitment_N:{proof_id}".encode()).hexdigest()
-            }
-        }
+        proof_id = self._next_id()
+        # Feed the sorted IDs into the hasher incrementally; the
+        # fingerprint stays deterministic without materializing the
+        # joined string (which can run to MBs for large token lists)
+        commitment_hash = _hash(b"%s:" % wallet_id.encode())
+        for sorted_token_id in sorted(token_ids):
+            commitment_hash.update(sorted_token_id.encode())
+            commitment_hash.update(b",")
+        proof_data = MembershipProofData(
+            commitment=commitment_hash.hexdigest(),
+            wallet_token_count=len(wallet_token_ids),
+            requested_token_count=len(requested_token_ids),
+            proof_elements=_derive_elements(proof_id, _MEMBERSHIP_LABELS)
+        )
         
         proof = ZKPProof(
             proof_id=proof_id,
@@ -286,11 +454,12 @@ class ZKPManager:
                 'token_ids': token_ids
             },
             private_inputs={
-                'wallet_token_ids': list(wallet_token_ids)
+                'wallet_token_ids': sorted(wallet_token_ids)  # deterministic order
             }
         )
-        
-        self.proofs[proof_id] = proof
+        proof._wallet_token_set = frozenset(wallet_token_ids)
+
+        self._store(proof)
         return proof
     
     def verify_membership_proof(self, proof_id: str) -> bool:
@@ -299,31 +468,27 @@ class ZKPManager:
         if not proof or proof.proof_type != ZKPType.MEMBERSHIP_PROOF:
             return False
         
-        # Mock verification logic
-        try:
-            token_ids = proof.statement.get('token_ids', [])
-            wallet_token_ids = proof.private_inputs.get('wallet_token_ids', [])
-            
-            # Check if all requested tokens are in wallet
-            is_valid = all(token_id in wallet_token_ids for token_id in token_ids)
-            
-            # Verify proof elements (simulated)
-            proof_elements = proof.proof_data.get('proof_elements', {})
-            required_elements = ['M', 'N']
-            
-            for element in required_elements:
-                if element not in proof_elements:
-                    is_valid = False
-                    break
-            
-            if is_valid:
-                proof.verified = True
-                proof.verification_timestamp = datetime.now().isoformat()
-            
-            return is_valid
-            
-        except Exception:
-            return False
+        # Mock verification logic; the .get defaults make every read
+        # total, so no exception guard is needed
+        token_ids = proof.statement.get('token_ids', [])
+        wallet_set = proof._wallet_token_set
+        if wallet_set is None:
+            wallet_set = proof._wallet_token_set = frozenset(
+                proof.private_inputs.get('wallet_token_ids', ()))
+
+        # Check if all requested tokens are in wallet — one C-level
+        # subset test instead of a list probe per token
+        is_valid = wallet_set.issuperset(token_ids)
+
+        # Verify proof elements (simulated)
+        is_valid = is_valid and _MEMBERSHIP_REQUIRED.issubset(proof.proof_data.proof_elements)
+
+        if is_valid:
+            proof.verified = True
+            proof.verification_timestamp = _now_iso()
+            self._verified_ids.add(proof_id)
+
+        return is_valid
     
     def get_proof(self, proof_id: str) -> Optional[ZKPProof]:
         """Get proof by ID"""
@@ -331,52 +496,67 @@ class ZKPManager:
     
     def get_proofs_by_type(self, proof_type: ZKPType) -> List[ZKPProof]:
         """Get all proofs of a specific type"""
-        return [proof for proof in self.proofs.values() if proof.proof_type == proof_type]
+        return [self.proofs[proof_id] for proof_id in self._by_type[proof_type]]
     
     def get_verified_proofs(self) -> List[ZKPProof]:
         """Get all verified proofs"""
-        return [proof for proof in self.proofs.values() if proof.verified]
+        return [self.proofs[proof_id] for proof_id in self._verified_ids]
     
     def get_unverified_proofs(self) -> List[ZKPProof]:
         """Get all unverified proofs"""
-        return [proof for proof in self.proofs.values() if not proof.verified]
+        # One C-level set difference instead of a membership test per proof
+        return [self.proofs[proof_id]
+                for proof_id in self.proofs.keys() - self._verified_ids]
     
     def list_all_proofs(self) -> List[ZKPProof]:
         """List all proofs"""
         return list(self.proofs.values())
     
+    def count_proofs(self) -> int:
+        """Count proofs without materializing a list"""
+        return len(self.proofs)
+    
     def get_zkp_statistics(self) -> Dict:
-        """Get ZKP statistics"""
+        """Get ZKP statistics
+
+        Every figure is read off the index sets maintained at store and
+        verify time, so the call is O(|ZKPType|) and never dereferences
+        a proof object.
+        """
         total_proofs = len(self.proofs)
-        verified_proofs = self.get_verified_proofs()
-        unverified_proofs = self.get_unverified_proofs()
-        
-        proof_types = {}
-        for proof_type in ZKPType:
-            proof_types[proof_type.value] = len(self.get_proofs_by_type(proof_type))
-        
+        verified_count = len(self._verified_ids)
+
+        proof_types = {proof_type.value: len(proof_ids)
+                       for proof_type, proof_ids in self._by_type.items()}
+
         return {
             'total_proofs': total_proofs,
-            'verified_proofs': len(verified_proofs),
-            'unverified_proofs': len(unverified_proofs),
-            'verification_rate': (len(verified_proofs) / total_proofs * 100) if total_proofs > 0 else 0,
+            'verified_proofs': verified_count,
+            'unverified_proofs': total_proofs - verified_count,
+            'verification_rate': (verified_count / total_proofs * 100) if total_proofs > 0 else 0,
             'proof_types': proof_types
         }
     
     def export_zkp_proofs(self, filename: str = None) -> str:
         """Export ZKP proofs to JSON file"""
+        # One clock read serves both the filename and the export header
+        now = datetime.now()
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"zkp_proofs_{timestamp}.json"
-        
-        export_data = {
-            'export_timestamp': datetime.now().isoformat(),
-            'total_proofs': len(self.proofs),
-            'statistics': self.get_zkp_statistics(),
-            'proofs': [proof.to_dict() for proof in self.proofs.values()]
-        }
-        
+            filename = f"zkp_proofs_{now.strftime('%Y%m%d_%H%M%S')}.json"
+
+        # Stream proofs one at a time instead of materializing every
+        # to_dict() result and the full document in memory
+        statistics = self.get_zkp_statistics()
         with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
-        
-        return filename 
\ No newline at end of file
+            f.write('{\n')
+            f.write(f'  "export_timestamp": {json.dumps(now.isoformat())},\n')
+            f.write(f'  "total_proofs": {statistics["total_proofs"]},\n')
+            f.write(f'  "statistics": {json.dumps(statistics)},\n')
+            f.write('  "proofs": [\n')
+            separator = ''
+            for proof in self.proofs.values():
+                f.write(separator + '    ' + json.dumps(proof.to_dict()))
+                separator = ',\n'
+            f.write('\n  ]\n}\n')
+
+        return filename
\ No newline at end of file
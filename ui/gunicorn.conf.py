@@ -0,0 +1,30 @@
+"""Gunicorn configuration for the PNS web UI
+
+Run from this directory with:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The whole system state (wallets, tokens, ledger) lives in process
+memory, so the worker count is pinned to one: extra workers would each
+hold an independent, diverging copy of the system. Concurrency comes
+from threads instead, which share the single PrivacyNetworkSystem the
+app builds at import. preload_app keeps that import-time construction
+(system init, compiled extractors, URL map, template bytecode) in the
+master so a respawned worker starts from the forked image instead of
+rebuilding it.
+"""
+
+import os
+
+bind = '%s:%s' % (os.getenv('PNS_HOST', '0.0.0.0'), os.getenv('PNS_PORT', '5000'))
+
+workers = 1
+threads = 16
+preload_app = True
+
+# Keep connections open between the browser's polling requests instead
+# of paying TCP setup per poll
+keepalive = 5
+
+# Lets a replacement master bind during zero-downtime restarts
+reuse_port = True